@@ -12,16 +12,40 @@ Catalan-Dickson conjecture:
 
 import collections
 from math import sqrt
+from pathlib import Path
 from time import perf_counter
-from typing import Iterable, TypeVar
+from typing import TYPE_CHECKING, Callable, Iterable, NamedTuple, TypeVar
 
-import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib.animation import FuncAnimation, PillowWriter
-from tqdm import tqdm
+from factorization import aliquot_sum_factored, proper_divisors_factored
+from progress import SweepProfiler
+from trajectory_cache import TrajectoryCache
+
+# numpy, matplotlib, the numpy backed modules and the process pool are imported by the functions that need them,
+# so computing a sequence doesn't pay for importing them or pull in a GUI backend
+if TYPE_CHECKING:
+    import numpy as np
+    import numpy.typing as npt
+
+    from progress import ProgressBar
+    from sequence_store import SequenceStore, SequenceStoreWriter
 
 T = TypeVar("T")
 
+SEQUENCE_FILES_DIR: Path = Path("./aliquot_sequences/sequence_files")
+# Above this, n is factored rather than trial divided up to sqrt(n)
+TRIAL_DIVISION_LIMIT: int = 10**6
+
+# How an aliquot sequence ends, see aliquot_sequence_classified
+PRIME_TERMINATED: str = "prime-terminated"
+PERFECT: str = "perfect"
+AMICABLE: str = "amicable"
+SOCIABLE: str = "sociable"
+OPEN: str = "open"
+
+# Per process state of parallel sweep workers, set by init_sweep_worker
+_worker_sum_table: "npt.NDArray[np.int64] | None" = None
+_worker_cache: "TrajectoryCache | None" = None
+
 def find_proper_divisors(n: int) -> "list[int]":
     """A positive divisor of n that is different from n"""
     if n < 1:
@@ -30,6 +54,8 @@ def find_proper_divisors(n: int) -> "list[int]":
     proper_divisors = []
     if n == 1:
         return proper_divisors  # 1 doesn't have any proper divisors, because it is it's only divisor
+    if n > TRIAL_DIVISION_LIMIT:
+        return proper_divisors_factored(n)
     for i in range(1, int(sqrt(n)) + 1):
         if n % i == 0:
             proper_divisors.append(i)
@@ -52,6 +78,26 @@ def aliquot_sum(proper_divisors: "list[int]") -> int:
     return sum(proper_divisors)
 
 
+def aliquot_sum_of(n: int, sum_table: "npt.NDArray[np.int64] | None" = None) -> int:
+    """
+    The aliquot sum of n, s(n).
+
+    Looked up in sum_table (see divisor_sieve.aliquot_sum_sieve) when n is within its bound,
+    otherwise computed from the prime factorization of n, without listing its divisors.
+
+    Args:
+        n (int): positive integer
+        sum_table (npt.NDArray[np.int64], optional): precomputed table where sum_table[n] == s(n).
+            Defaults to None.
+
+    Returns:
+        int: the sum of the proper divisors of n
+    """
+    if sum_table is not None and n < len(sum_table):
+        return int(sum_table[n])
+    return aliquot_sum_factored(n)
+
+
 def find_duplicates(items: Iterable[T]) -> "list[T]":
     """Find duplicate items in an iterable."""
     return [item for item, count in collections.Counter(items).items() if count > 1]
@@ -69,24 +115,194 @@ def flatten(l: list[list[T]]) -> list[T]:
     return flat
 
 
-def aliquot_sequence_recursive(n: int, al_seq: "list[int]" = None, pbar: tqdm = None, seq_iteration_cutoff: int = 100):
-    """Recursive implementation to create aliquot sequence"""
+def aliquot_sequence_recursive(
+    n: int,
+    al_seq: "list[int]" = None,
+    pbar: "ProgressBar | None" = None,
+    seq_iteration_cutoff: int = 100,
+    sum_table: "npt.NDArray[np.int64] | None" = None,
+    seen: "set[int] | None" = None,
+):
+    """
+    Recursive implementation to create aliquot sequence
+
+    Every term is one more level of recursion, so seq_iteration_cutoff has to stay well below
+    sys.getrecursionlimit(). Use aliquot_sequence for long sequences.
+    """
     if al_seq is None:
         al_seq = []
+    if seen is None:
+        seen = set(al_seq)
 
-    if not (len(al_seq) > 1 and len(find_duplicates(al_seq)) > 0):
+    # seen is set(al_seq), so it is smaller than al_seq once there is a duplicate
+    if len(seen) == len(al_seq):
         if n > 0 and len(al_seq) < seq_iteration_cutoff:
-            pbar.update(1)
-            al_sum = aliquot_sum(find_proper_divisors(n))
+            if pbar is not None:
+                pbar.update(1)
+            al_sum = aliquot_sum_of(n, sum_table)
 
             al_seq.append(al_sum)
-            aliquot_sequence_recursive(al_sum, al_seq=al_seq, pbar=pbar)
+            seen.add(al_sum)
+            aliquot_sequence_recursive(
+                al_sum,
+                al_seq=al_seq,
+                pbar=pbar,
+                seq_iteration_cutoff=seq_iteration_cutoff,
+                sum_table=sum_table,
+                seen=seen,
+            )
 
     return al_seq
 
 
+class AliquotResult(NamedTuple):
+    """
+    An aliquot sequence and how it ends.
+
+    classification is one of PRIME_TERMINATED, PERFECT, AMICABLE, SOCIABLE or OPEN. period is the length of the
+    cycle for perfect, amicable and sociable sequences, and prime is the prime reached just before 1 for prime
+    terminated ones (None for n = 1, which goes straight to 0). sequence is None when it wasn't kept.
+    """
+
+    sequence: "list[int] | None"
+    classification: str
+    period: "int | None" = None
+    prime: "int | None" = None
+
+
+def classify_cycle(period: int) -> str:
+    """Classification of a sequence that ends in a cycle of the given period."""
+    if period == 1:
+        return PERFECT
+    if period == 2:
+        return AMICABLE
+    return SOCIABLE
+
+
+class AliquotCycle(NamedTuple):
+    """A perfect number, amicable pair or sociable cycle, listed from its smallest member."""
+
+    members: "tuple[int, ...]"
+    classification: str
+
+
+def aliquot_cycle_catalog(
+    n: int, sum_table: "npt.NDArray[np.int64] | None" = None, path: "Path | None" = None
+) -> "list[AliquotCycle]":
+    """
+    Every aliquot cycle whose members are all <= n, each listed once, in increasing order of smallest member.
+
+    The cycles come from the functional graph of the sum table, see cycle_catalog, rather than from the
+    sequence of every starting value, so this takes about as long as sieving the table.
+
+    Args:
+        n (int): bound on the members of the cycles
+        sum_table (npt.NDArray[np.int64], optional): aliquot sums of 0..n, if already sieved. Defaults to None.
+        path (Path, optional): also write the catalog to a text file, one `smallest-[members]` line per cycle.
+            Defaults to None.
+
+    Returns:
+        list[AliquotCycle]: cycles and their classification
+
+    Examples:
+    >>> [(cycle.members, cycle.classification) for cycle in aliquot_cycle_catalog(1500)][1:3]
+    [((28,), 'perfect'), ((220, 284), 'amicable')]
+    """
+    from cycle_catalog import aliquot_cycles
+    from divisor_sieve import aliquot_sum_sieve
+
+    if sum_table is None:
+        sum_table = aliquot_sum_sieve(n)
+    catalog = [AliquotCycle(cycle, classify_cycle(len(cycle))) for cycle in aliquot_cycles(sum_table[: n + 1])]
+
+    if path is not None:
+        with open(path, "w", encoding="utf-8") as f:
+            for cycle in catalog:
+                f.write(f"{cycle.members[0]}-{list(cycle.members)}\n")
+
+    return catalog
+
+
+def aliquot_sequence_classified(
+    n: int,
+    seq_iteration_cutoff: int = 100,
+    allow_repetition: bool = False,
+    pbar: "ProgressBar | None" = None,
+    sum_table: "npt.NDArray[np.int64] | None" = None,
+    al_seq: "list[int] | None" = None,
+    cache: "TrajectoryCache | None" = None,
+) -> AliquotResult:
+    """
+    The aliquot sequence of n, see aliquot_sequence, along with how it ends.
+
+    The first position of every term is kept in a dict as the sequence grows, so checking for a repeat and
+    measuring the period of the cycle are O(1) per term, and sequences of 10^4+ terms stay cheap.
+
+    Returns:
+        AliquotResult: aliquot sequence for n and its classification
+
+    Examples:
+    >>> aliquot_sequence_classified(12)
+    AliquotResult(sequence=[16, 15, 9, 4, 3, 1, 0], classification='prime-terminated', period=None, prime=3)
+    >>> aliquot_sequence_classified(95).classification, aliquot_sequence_classified(95).period
+    ('perfect', 1)
+    >>> aliquot_sequence_classified(220)
+    AliquotResult(sequence=[284, 220], classification='amicable', period=2, prime=None)
+    >>> aliquot_sequence_classified(12496).classification, aliquot_sequence_classified(12496).period
+    ('sociable', 5)
+    >>> aliquot_sequence_classified(276, seq_iteration_cutoff=10).classification
+    'open'
+    """
+    start = n
+    al_seq = [] if al_seq is None else list(al_seq)
+    positions = {}  # first position of every term
+    for position, term in enumerate(al_seq):
+        positions.setdefault(term, position)
+    if al_seq:
+        n = al_seq[-1]
+    repeated = period = None
+    # Sequence is unknown length for some n, set an iteration bound
+    while (n > 0) and (len(al_seq) < seq_iteration_cutoff):
+        if pbar is not None:
+            pbar.update(1)
+
+        if cache is None or n <= cache.table_limit:
+            al_sum = aliquot_sum_of(n, sum_table)
+        else:
+            al_sum = cache.successor(n)
+            if al_sum is None:
+                al_sum = aliquot_sum_of(n, sum_table)
+                cache.add_successor(n, al_sum)
+        n = al_sum
+        # If new aliquot sum is already in the sequence, then sequence will loop, if not allowing repetition
+        if n in positions:
+            if repeated is None:
+                repeated = n
+                period = len(al_seq) - positions[n]
+            if not allow_repetition:
+                break
+        else:
+            positions[n] = len(al_seq)
+
+        al_seq.append(n)
+
+    if repeated is not None:
+        return AliquotResult(al_seq, classify_cycle(period), period=period)
+    if al_seq and al_seq[-1] == 0:
+        # ..., p, 1, 0 where s(p) = 1 only for prime p
+        prime = al_seq[-3] if len(al_seq) >= 3 else (start if len(al_seq) == 2 else None)
+        return AliquotResult(al_seq, PRIME_TERMINATED, prime=prime)
+    return AliquotResult(al_seq, OPEN)
+
+
 def aliquot_sequence(
-    n: int, seq_iteration_cutoff: int = 100, allow_repetition: bool = False, pbar: tqdm = None
+    n: int,
+    seq_iteration_cutoff: int = 100,
+    allow_repetition: bool = False,
+    pbar: "ProgressBar | None" = None,
+    sum_table: "npt.NDArray[np.int64] | None" = None,
+    al_seq: "list[int] | None" = None,
+    cache: "TrajectoryCache | None" = None,
 ) -> "list[int]":
     """
     A sequence of positive integers in which each term is the sum of the proper divisors of the previous term.
@@ -99,7 +315,13 @@ def aliquot_sequence(
             aliquot sequence is currently unknown. Defaults to 100.
         allow_repetition (bool, optional): Allow sequence to run (until seq_iteration_cutoff) to show repeated values.
             Defaults to False.
-        pbar (tqdm, optional): tqdm progress bar. Defaults to None.
+        pbar (ProgressBar, optional): progress bar, see progress.progress_bar. Defaults to None.
+        sum_table (npt.NDArray[np.int64], optional): precomputed aliquot sums, terms within its bound are
+            looked up instead of factored. Defaults to None.
+        al_seq (list[int], optional): terms of the sequence that are already known, eg from a checkpoint.
+            The sequence continues from the last of them. Defaults to None.
+        cache (TrajectoryCache, optional): successors shared between sequences. Terms above its table limit
+            that another sequence already visited are followed instead of factored again. Defaults to None.
 
     Returns:
         list[int]: aliquot sequence for n
@@ -113,197 +335,652 @@ def aliquot_sequence(
     [6]
     >>> aliquot_sequence(220)
     [284, 220]
+    >>> aliquot_sequence(12, al_seq=[16, 15])
+    [16, 15, 9, 4, 3, 1, 0]
     """
-    al_seq = []
-    # Sequence is unknown length for some n, set an iteration bound
-    while (n > 0) and (len(al_seq) < seq_iteration_cutoff):
-        if pbar is not None:
-            pbar.update(1)
+    return aliquot_sequence_classified(
+        n,
+        seq_iteration_cutoff=seq_iteration_cutoff,
+        allow_repetition=allow_repetition,
+        pbar=pbar,
+        sum_table=sum_table,
+        al_seq=al_seq,
+        cache=cache,
+    ).sequence
+
+
+def classify_aliquot_sequence_low_memory(
+    n: int, seq_iteration_cutoff: int = 100, sum_table: "npt.NDArray[np.int64] | None" = None
+) -> AliquotResult:
+    """
+    Classify the aliquot sequence of n in O(1) memory with Brent's cycle detection, without keeping its terms.
 
-        #TODO check text file for existing divisors list, else generate them, and save to list?
-        n = aliquot_sum(find_proper_divisors(n))
-        # If new aliquot sum is already in the sequence, then sequence will loop, if not allowing repetition
-        if not allow_repetition and n in set(al_seq):
-            break
+    The tortoise jumps to the hare at every power of two steps, and the distance the hare has run since is the
+    period once they meet. A cycle is only recognized once the hare has gone around it, which can take up to about
+    twice as many steps as the first repeat, so seq_iteration_cutoff here bounds the steps of the hare.
 
-        al_seq.append(n)
+    Returns:
+        AliquotResult: classification of the sequence of n, sequence is None
 
-    return al_seq
+    Examples:
+    >>> classify_aliquot_sequence_low_memory(12)
+    AliquotResult(sequence=None, classification='prime-terminated', period=None, prime=3)
+    >>> classify_aliquot_sequence_low_memory(12496)
+    AliquotResult(sequence=None, classification='sociable', period=5, prime=None)
+    """
+    if n < 1:
+        raise ValueError("Must be a positive integer.")
 
+    before_last, last = None, n  # the two terms before the hare
+    tortoise, hare = n, aliquot_sum_of(n, sum_table)
+    steps = power = period = 1
+    while tortoise != hare:
+        if hare == 0:
+            # ..., p, 1, 0 where s(p) = 1 only for prime p
+            prime = before_last if before_last is not None else (None if n == 1 else n)
+            return AliquotResult(None, PRIME_TERMINATED, prime=prime)
+        if steps >= seq_iteration_cutoff:
+            return AliquotResult(None, OPEN)
+        if power == period:
+            tortoise = hare
+            power *= 2
+            period = 0
+        before_last, last = last, hare
+        hare = aliquot_sum_of(hare, sum_table)
+        steps += 1
+        period += 1
+
+    return AliquotResult(None, classify_cycle(period), period=period)
+
+
+def aliquot_sequence_resumable(
+    n: int,
+    save: "Callable[[int, list[int]], None]",
+    al_seq: "list[int] | None" = None,
+    seq_iteration_cutoff: int = 100,
+    checkpoint_terms: int = 1000,
+    pbar: "ProgressBar | None" = None,
+    sum_table: "npt.NDArray[np.int64] | None" = None,
+    cache: "TrajectoryCache | None" = None,
+) -> "list[int]":
+    """
+    aliquot_sequence computed in chunks of checkpoint_terms terms, handing the terms so far to save after every
+    chunk that doesn't finish the sequence. Short sequences finish in the first chunk and are never saved.
 
-def aliquot_sequence_sequences(n: int):
-    with open("./aliquot_sequences/sequence_files/proper_divisor_lists.txt", "w", encoding="utf-8") as f:
-        f.write("")
-    with open("./aliquot_sequences/sequence_files/proper_divisors_length.txt", "w", encoding="utf-8") as f:
-        f.write("")
-    with open("./aliquot_sequences/sequence_files/aliquot_sums.txt", "w", encoding="utf-8") as f:
-        f.write("")
-    with open("./aliquot_sequences/sequence_files/aliquot_sequence.txt", "w", encoding="utf-8") as f:
-        f.write("")
-    with open("./aliquot_sequences/sequence_files/aliquot_sequence_length.txt", "w", encoding="utf-8") as f:
-        f.write("")
+    Args:
+        n (int): initializing value of the sequence
+        save (Callable[[int, list[int]], None]): called with n and the terms so far
+        al_seq (list[int], optional): previously saved terms to continue from. Defaults to None.
+        seq_iteration_cutoff (int, optional): An iteration bound for sequences. Defaults to 100.
+        checkpoint_terms (int, optional): number of terms between saves. Defaults to 1000.
+        pbar (ProgressBar, optional): progress bar, see progress.progress_bar. Defaults to None.
+        sum_table (npt.NDArray[np.int64], optional): precomputed aliquot sums. Defaults to None.
+        cache (TrajectoryCache, optional): trajectory cache shared between sequences. Defaults to None.
+
+    Returns:
+        list[int]: aliquot sequence for n
+    """
+    al_seq = [] if al_seq is None else al_seq
+    while True:
+        chunk_cutoff = min(len(al_seq) + checkpoint_terms, seq_iteration_cutoff)
+        al_seq = aliquot_sequence(
+            n, seq_iteration_cutoff=chunk_cutoff, pbar=pbar, sum_table=sum_table, al_seq=al_seq, cache=cache
+        )
+        # stopping short of the chunk means it reached 0 or a repeat
+        if len(al_seq) < chunk_cutoff or chunk_cutoff == seq_iteration_cutoff:
+            return al_seq
+        save(n, al_seq)
+
+
+def aliquot_sequence_checkpointed(
+    n: int,
+    checkpoint_path: Path,
+    seq_iteration_cutoff: int = 100,
+    checkpoint_terms: int = 1000,
+    pbar: "ProgressBar | None" = None,
+    sum_table: "npt.NDArray[np.int64] | None" = None,
+) -> "list[int]":
+    """
+    aliquot_sequence for long running open sequences, eg 276, that picks up from its last checkpoint.
+
+    Every checkpoint_terms terms the sequence so far is saved to checkpoint_path. Calling it again with the same
+    n and checkpoint_path continues from the last saved term instead of starting over.
+
+    Raises:
+        ValueError: if checkpoint_path holds the sequence of a different n.
+
+    Returns:
+        list[int]: aliquot sequence for n
+    """
+    from sequence_store import load_checkpoint, save_checkpoint
+
+    checkpoint = load_checkpoint(checkpoint_path)
+    if checkpoint is not None and checkpoint["n"] != n:
+        raise ValueError(f"{checkpoint_path} is a checkpoint for n={checkpoint['n']}, not n={n}.")
+
+    return aliquot_sequence_resumable(
+        n,
+        save=lambda n, al_seq: save_checkpoint(checkpoint_path, {"n": n, "al_seq": al_seq}),
+        al_seq=None if checkpoint is None else checkpoint["al_seq"],
+        seq_iteration_cutoff=seq_iteration_cutoff,
+        checkpoint_terms=checkpoint_terms,
+        pbar=pbar,
+        sum_table=sum_table,
+    )
+
+
+class AliquotRecord(NamedTuple):
+    """Everything the sequence store keeps for one n."""
+
+    n: int
+    proper_divisors: "list[int]"
+    al_sum: int
+    al_seq: "list[int]"
+    al_seq_length: int
+
+
+def aliquot_record(
+    n: int,
+    seq_iteration_cutoff: int = 100,
+    pbar: "ProgressBar | None" = None,
+    sum_table: "npt.NDArray[np.int64] | None" = None,
+    al_seq: "list[int] | None" = None,
+    cache: "TrajectoryCache | None" = None,
+    save: "Callable[[int, list[int]], None] | None" = None,
+    checkpoint_terms: int = 1000,
+    profiler: "SweepProfiler | None" = None,
+) -> AliquotRecord:
+    """
+    Proper divisors, aliquot sum and aliquot sequence of n, each computed once.
+
+    The aliquot sum is the sum of the divisor list, and it is also the first term of the sequence, so the
+    sequence starts from it instead of computing s(n) again.
+
+    Args:
+        n (int): initializing value of the sequence
+        seq_iteration_cutoff (int, optional): An iteration bound for sequences. Defaults to 100.
+        pbar (ProgressBar, optional): progress bar, see progress.progress_bar. Defaults to None.
+        sum_table (npt.NDArray[np.int64], optional): precomputed aliquot sums. Defaults to None.
+        al_seq (list[int], optional): previously saved terms of the sequence to continue from. Defaults to None.
+        cache (TrajectoryCache, optional): trajectory cache shared between sequences. Defaults to None.
+        save (Callable[[int, list[int]], None], optional): checkpoint long sequences through
+            aliquot_sequence_resumable. Defaults to None.
+        checkpoint_terms (int, optional): number of terms between saves. Defaults to 1000.
+        profiler (SweepProfiler, optional): times the divisors, sum and sequence stages, and counts sequence
+            terms. Defaults to None.
+
+    Returns:
+        AliquotRecord: the results for n
+
+    Examples:
+    >>> aliquot_record(12)
+    AliquotRecord(n=12, proper_divisors=[1, 2, 3, 4, 6], al_sum=16, al_seq=[16, 15, 9, 4, 3, 1, 0], al_seq_length=7)
+    """
+    proper_divisors = find_proper_divisors(n)
+    if profiler is not None:
+        profiler.lap("divisors")
+    al_sum = aliquot_sum(proper_divisors)
+    if profiler is not None:
+        profiler.lap("sum")
+    if al_seq is None:
+        al_seq = [al_sum]
+
+    if save is None:
+        al_seq = aliquot_sequence(
+            n, seq_iteration_cutoff=seq_iteration_cutoff, pbar=pbar, sum_table=sum_table, al_seq=al_seq, cache=cache
+        )
+    else:
+        al_seq = aliquot_sequence_resumable(
+            n,
+            save=save,
+            al_seq=al_seq,
+            seq_iteration_cutoff=seq_iteration_cutoff,
+            checkpoint_terms=checkpoint_terms,
+            pbar=pbar,
+            sum_table=sum_table,
+            cache=cache,
+        )
+
+    if profiler is not None:
+        profiler.lap("sequence")
+        profiler.count("terms", len(al_seq))
+    # the sequence stops before its first repeat, so every term is distinct
+    return AliquotRecord(n, proper_divisors, al_sum, al_seq, len(al_seq))
+
+
+def benchmark_records(n: int = 10**5, seq_iteration_cutoff: int = 100) -> None:
+    """
+    Throughput of computing the sweep results for 1..n, before and after aliquot_record.
+
+    Before is what aliquot_sequence_sequences used to do for every i: list the divisors, sum them, then run the
+    sequence twice, recursively and iteratively, and throw the first one away. Neither writes to disk.
+
+    Args:
+        n: largest initializing value
+        seq_iteration_cutoff: An iteration bound for sequences
+    """
+    from divisor_sieve import aliquot_sum_sieve
+
+    sum_table = aliquot_sum_sieve(n)
 
-    for i in tqdm(range(1, n+1), total=n, ascii=" ░▒█", ncols=100):
+    counter_start = perf_counter()
+    for i in range(1, n + 1):
         divisor_list = find_proper_divisors(i)
         al_sum = aliquot_sum(divisor_list)
+        al_seq = aliquot_sequence_recursive(i, seq_iteration_cutoff=seq_iteration_cutoff, sum_table=sum_table)
+        al_seq = aliquot_sequence(i, seq_iteration_cutoff=seq_iteration_cutoff, sum_table=sum_table)
+    before = perf_counter() - counter_start
 
-        pbar = tqdm(leave=False)
-        al_seq = aliquot_sequence_recursive(i, pbar=pbar)
-        al_seq = aliquot_sequence(i, allow_repetition=False, pbar=pbar)
+    counter_start = perf_counter()
+    for i in range(1, n + 1):
+        aliquot_record(i, seq_iteration_cutoff=seq_iteration_cutoff, sum_table=sum_table)
+    after = perf_counter() - counter_start
 
-        with open("./aliquot_sequences/sequence_files/proper_divisor_lists.txt", "a", encoding="utf-8") as f:
-            f.write(f"{i}-{divisor_list}\n")
-        with open("./aliquot_sequences/sequence_files/proper_divisors_length.txt", "a", encoding="utf-8") as f:
-            f.write(f"{i}-{len(divisor_list)}\n")
-        with open("./aliquot_sequences/sequence_files/aliquot_sums.txt", "a", encoding="utf-8") as f:
-            f.write(f"{i}-{al_sum}\n")
-        with open("./aliquot_sequences/sequence_files/aliquot_sequence.txt", "a", encoding="utf-8") as f:
-            f.write(f"{i}-{al_seq}\n")
-        with open("./aliquot_sequences/sequence_files/aliquot_sequence_length.txt", "a", encoding="utf-8") as f:
-            f.write(f"{i}-{len(set(al_seq))}\n")
+    cache = TrajectoryCache(table_limit=n)
+    counter_start = perf_counter()
+    for i in range(1, n + 1):
+        aliquot_record(i, seq_iteration_cutoff=seq_iteration_cutoff, sum_table=sum_table, cache=cache)
+    after_cached = perf_counter() - counter_start
 
+    print(f"before (divisors, sum, recursive + iterative sequence): {before:.2f} s, {n / before:.0f} n/s")
+    print(f"aliquot_record: {after:.2f} s, {n / after:.0f} n/s")
+    print(f"aliquot_record with TrajectoryCache: {after_cached:.2f} s, {n / after_cached:.0f} n/s")
 
-def animate_sequences():
-    fig, ax = plt.subplots()
 
-    x = np.arange(0, 2*np.pi, 0.01)
-    line, = ax.plot(x, np.sin(x))
+def benchmark_backends(ns: "Iterable[int]" = (138, 840), seq_iteration_cutoff: int = 170) -> None:
+    """
+    Time the aliquot sequences of ns with every available arithmetic backend, see factorization.set_backend,
+    and check that they agree term for term.
 
+    840 reaches 29 digit terms within 170 steps, and composites beyond that take minutes to split with either
+    backend, hence the cutoff.
 
-    def animate(i):
-        line.set_ydata(np.sin(x + i / 50))  # update the data.
-        return line,
+    Raises:
+        AssertionError: if the backends give different sequences.
+    """
+    import factorization
+
+    previous = factorization.current_backend()
+    try:
+        for n in ns:
+            sequences = {}
+            for name in factorization.available_backends():
+                factorization.set_backend(name)
+                counter_start = perf_counter()
+                sequences[name] = aliquot_sequence(n, seq_iteration_cutoff=seq_iteration_cutoff)
+                elapsed = perf_counter() - counter_start
+                print(f"n={n} {name}: {elapsed:.3f} s, {len(sequences[name])} terms, "
+                      f"largest {len(str(max(sequences[name])))} digits")
+            assert all(sequence == sequences["python"] for sequence in sequences.values()), f"backends differ for {n}"
+    finally:
+        factorization.set_backend(previous.name)
+
+
+def aliquot_sequence_sequences(
+    n: int,
+    sum_table_limit: "int | None" = None,
+    directory: Path = SEQUENCE_FILES_DIR,
+    resume: bool = False,
+    seq_iteration_cutoff: int = 100,
+    checkpoint_terms: int = 1000,
+    cache: "TrajectoryCache | None" = None,
+    workers: int = 1,
+    reverse_index: bool = False,
+    progress: bool = True,
+    display_interval: float = 0.5,
+    profile_path: "Path | None" = None,
+    first_n: int = 1,
+    sum_table: "npt.NDArray[np.int64] | None" = None,
+) -> None:
+    """
+    Write the proper divisors, aliquot sum and aliquot sequence of every i in first_n..n to the sequence store.
 
+    The store is checkpointed as it is written. The checkpoint holds the rows that are safely on disk, and for a
+    sequence that runs past checkpoint_terms terms, the terms computed so far. With resume=True the sweep continues
+    after the last checkpointed row, so an interrupted sweep loses at most one batch, and a finished sweep can be
+    extended to a larger n.
 
-    ani = FuncAnimation(
-        fig, animate, interval=20, blit=True, save_count=50)
+    Args:
+        n (int): largest initializing value
+        sum_table_limit (int, optional): bound of the sieved aliquot sum table. Sequence terms above it are
+            factored by aliquot_sum_factored, with Miller-Rabin and Pollard-Brent. Defaults to n.
+        directory (Path, optional): sequence store directory. Defaults to SEQUENCE_FILES_DIR.
+        resume (bool, optional): continue from the checkpoint in directory if there is one, otherwise any
+            existing store is overwritten. Defaults to False.
+        seq_iteration_cutoff (int, optional): An iteration bound for sequences. Defaults to 100.
+        checkpoint_terms (int, optional): number of terms between checkpoints of a single long sequence.
+            Defaults to 1000.
+        cache (TrajectoryCache, optional): trajectory cache shared by every sequence of the sweep.
+            In a parallel sweep every worker keeps a cache of its own instead. Defaults to a new
+            TrajectoryCache of the terms above the sum table.
+        workers (int, optional): number of worker processes, see sweep_parallel. The store is identical to a
+            serial sweep. Defaults to 1, run serially.
+        reverse_index (bool, optional): also write the reverse aliquot index of the sum table to directory, see
+            build_reverse_index. Defaults to False.
+        progress (bool, optional): show a progress bar with the share of time spent in every stage.
+            Defaults to True.
+        display_interval (float, optional): least seconds between progress bar updates. Defaults to 0.5.
+        profile_path (Path, optional): write a JSON report of the row counts, cache counters and cumulative time
+            of every stage (sieve, divisors, sum, sequence, write) here at the end. Defaults to None.
+            Without progress or profile_path nothing is timed at all.
+        first_n (int, optional): first initializing value of a new store, eg the start of a shard. A resumed
+            store keeps its own. Defaults to 1.
+        sum_table (npt.NDArray[np.int64], optional): aliquot sum table to use instead of sieving one up to
+            sum_table_limit, eg shared by the shards of a work queue. Defaults to None.
 
-    # To save the animation, use e.g.
-    #
-    # ani.save("movie.mp4")
-    #
-    # or
-    #
-    # writer = animation.FFMpegWriter(
-    #     fps=15, metadata=dict(artist='Me'), bitrate=1800)
-    # ani.save("movie.mp4", writer=writer)
+    Examples:
+    >>> import tempfile
+    >>> from sequence_store import open_sequence_store
+    >>> with tempfile.TemporaryDirectory() as directory:
+    ...     aliquot_sequence_sequences(300, directory=Path(directory), progress=False)
+    ...     al_seq = open_sequence_store(Path(directory)).sequence(276 - 1)
+    >>> al_seq == aliquot_sequence(276), max(al_seq) > 2**64
+    (True, True)
+    """
+    from divisor_sieve import aliquot_sum_sieve
+    from reverse_index import build_reverse_index
+    from sequence_store import CHECKPOINT_FILENAME, SequenceStoreWriter, load_checkpoint
+
+    checkpoint = load_checkpoint(directory.joinpath(CHECKPOINT_FILENAME)) if resume else None
+    resume_rows = None if checkpoint is None else checkpoint["rows"]
+    open_sequence = {} if checkpoint is None else checkpoint.get("open_sequence", {})
+    profiler = None
+    if progress or profile_path is not None:
+        profiler = SweepProfiler(
+            total=n, initial=first_n - 1 + (resume_rows or 0), display=progress, display_interval=display_interval
+        )
+
+    if sum_table is None:
+        sum_table = aliquot_sum_sieve(sum_table_limit if sum_table_limit is not None else n)
+    if reverse_index:
+        build_reverse_index(len(sum_table) - 1, directory, sum_table)
+    if cache is None:
+        cache = TrajectoryCache(table_limit=len(sum_table) - 1)
+    if profiler is not None:
+        profiler.lap("sieve")
+
+    with SequenceStoreWriter(directory, first_n=first_n, checkpoint=True, resume_rows=resume_rows) as writer:
+
+        def save_open_sequence(i: int, al_seq: "list[int]") -> None:
+            writer.checkpoint_state = {"open_sequence": {"n": i, "al_seq": al_seq}}
+            writer.flush()
+
+        start = writer.first_n + writer.rows
+        if workers > 1:
+            sweep_parallel(writer, start, n, workers, sum_table, seq_iteration_cutoff, open_sequence, profiler)
+        else:
+            for i in range(start, n + 1):
+                record = aliquot_record(
+                    i,
+                    seq_iteration_cutoff=seq_iteration_cutoff,
+                    sum_table=sum_table,
+                    al_seq=open_sequence.get("al_seq") if open_sequence.get("n") == i else None,
+                    cache=cache,
+                    save=save_open_sequence,
+                    checkpoint_terms=checkpoint_terms,
+                    profiler=profiler,
+                )
+
+                writer.checkpoint_state = {}
+                writer.append(record.proper_divisors, record.al_sum, record.al_seq, record.al_seq_length)
+                if profiler is not None:
+                    profiler.lap("write")
+                    profiler.advance()
+
+    if profiler is not None:
+        # closing the writer flushes and syncs the last batch
+        profiler.lap("write")
+        if workers <= 1:
+            # a parallel sweep merged the counters of the worker caches instead, the cache here went unused
+            profiler.count("cache_hits", cache.hits)
+            profiler.count("cache_misses", cache.misses)
+            profiler.count("cache_evictions", cache.evictions)
+        profiler.close()
+        if profile_path is not None:
+            profiler.write_report(profile_path)
+
+
+def init_sweep_worker(sum_table: "npt.NDArray[np.int64]") -> None:
+    """Process pool initializer, every worker keeps the sum table and a trajectory cache of its own."""
+    global _worker_sum_table, _worker_cache
+    _worker_sum_table = sum_table
+    _worker_cache = TrajectoryCache(table_limit=len(sum_table) - 1)
+
+
+def sweep_chunk(
+    start: int, stop: int, seq_iteration_cutoff: int, open_sequence: dict, profile: bool = False
+) -> "tuple[list[AliquotRecord], float, dict | None]":
+    """
+    Compute the store rows for start <= i < stop in a sweep worker.
 
-    plt.show()
+    Returns:
+        tuple[list[AliquotRecord], float, dict | None]: record of every i, the seconds it took, and with profile
+            the stage timings and counters of the chunk, including what it added to the worker cache counters
+    """
+    counter_start = perf_counter()
+    profiler = SweepProfiler(display=False) if profile else None
+    cache_counters = (_worker_cache.hits, _worker_cache.misses, _worker_cache.evictions)
+    records = [
+        aliquot_record(
+            i,
+            seq_iteration_cutoff=seq_iteration_cutoff,
+            sum_table=_worker_sum_table,
+            al_seq=open_sequence.get("al_seq") if open_sequence.get("n") == i else None,
+            cache=_worker_cache,
+            profiler=profiler,
+        )
+        for i in range(start, stop)
+    ]
+    profile_report = None
+    if profiler is not None:
+        # the worker's cache outlives the chunk, report what the chunk added to its counters
+        for counter, before in zip(("cache_hits", "cache_misses", "cache_evictions"), cache_counters):
+            profiler.count(counter, getattr(_worker_cache, counter.removeprefix("cache_")) - before)
+        profile_report = {"timings": profiler.timings, "counters": profiler.counters}
+    return records, perf_counter() - counter_start, profile_report
+
+
+def sweep_parallel(
+    writer: "SequenceStoreWriter",
+    start: int,
+    n: int,
+    workers: int,
+    sum_table: "npt.NDArray[np.int64]",
+    seq_iteration_cutoff: int = 100,
+    open_sequence: "dict | None" = None,
+    profiler: "SweepProfiler | None" = None,
+    chunk_seconds: float = 0.5,
+    min_chunk: int = 16,
+    max_chunk: int = 65536,
+) -> None:
+    """
+    Sweep start..n across a process pool, writing records to writer in n order.
 
+    Sequence lengths vary wildly with n, so chunk sizes adapt: every finished chunk updates a running estimate of
+    rows per second, and new chunks are sized to take about chunk_seconds. At most two chunks per worker are in
+    flight, finished chunks wait until every chunk before them has been written. Rows only depend on i, so the
+    result is identical to the serial sweep.
 
-def open_sequence_files() -> tuple[list[list[int]], list[int], list[int], list[list[int]], list[int]]:
-    with open("./aliquot_sequences/sequence_files/proper_divisor_lists.txt", "r", encoding="utf-8") as f:
-        proper_divisor_lists_import = []
-        for line in f:
-            proper_divisor_lists_import.append(
-                line.strip().replace("[","").replace("]","").split("-")[1:][0].split(",")
-            )
-        proper_divisor_lists = []
-        for l in proper_divisor_lists_import:
-            new_line = []
-            for val in l:
-                if val == "":
-                    continue
-                new_line.append(int(val))
-            proper_divisor_lists.append(new_line)
-    with open("./aliquot_sequences/sequence_files/proper_divisors_length.txt", "r", encoding="utf-8") as f:
-        proper_divisors_length = []
-        for line in f:
-            proper_divisors_length.append(line.strip().replace("[","").replace("]","").split("-")[1:][0].split(","))
-        proper_divisors_length = [int(val) for l in proper_divisors_length for val in l]
-    with open("./aliquot_sequences/sequence_files/aliquot_sums.txt", "r", encoding="utf-8") as f:
-        aliquot_sums = []
-        for line in f:
-            aliquot_sums.append(line.strip().replace("[","").replace("]","").split("-")[1:][0].split(","))
-        aliquot_sums = [int(val) for l in aliquot_sums for val in l]
-    with open("./aliquot_sequences/sequence_files/aliquot_sequence.txt", "r", encoding="utf-8") as f:
-        aliquot_sequence_list_import = []
-        for line in f:
-            aliquot_sequence_list_import.append(
-                line.strip().replace("[","").replace("]","").split("-")[1:][0].split(",")
-            )
-        aliquot_sequence_list = []
-        for l in aliquot_sequence_list_import:
-            new_line = []
-            for val in l:
-                if val == "":
+    Args:
+        writer (SequenceStoreWriter): store to append the rows to
+        start (int): first i to compute
+        n (int): last i to compute
+        workers (int): number of worker processes
+        sum_table (npt.NDArray[np.int64]): precomputed aliquot sums
+        seq_iteration_cutoff (int, optional): An iteration bound for sequences. Defaults to 100.
+        open_sequence (dict, optional): checkpointed {"n", "al_seq"} of a sequence to continue. Defaults to None.
+        profiler (SweepProfiler, optional): progress display, and the stage timings summed over the workers.
+            Defaults to None.
+        chunk_seconds (float, optional): target compute time of a chunk. Defaults to 0.5.
+        min_chunk (int, optional): smallest chunk size. Defaults to 16.
+        max_chunk (int, optional): largest chunk size. Defaults to 65536.
+    """
+    from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+    open_sequence = open_sequence or {}
+    pending = {}  # chunk start -> future
+    finished = {}  # chunk start -> rows
+    next_submit = next_write = start
+    chunk_size = min_chunk
+    rows_per_second = None
+
+    profile = profiler is not None
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_sweep_worker, initargs=(sum_table,)) as pool:
+        while next_write <= n:
+            while next_submit <= n and len(pending) < 2 * workers:
+                stop = min(next_submit + chunk_size, n + 1)
+                chunk_open_sequence = open_sequence if next_submit <= open_sequence.get("n", 0) < stop else {}
+                pending[next_submit] = pool.submit(
+                    sweep_chunk, next_submit, stop, seq_iteration_cutoff, chunk_open_sequence, profile
+                )
+                next_submit = stop
+
+            done, _ = wait(pending.values(), return_when=FIRST_COMPLETED)
+            if profiler is not None:
+                profiler.lap("wait")
+            for chunk_start, future in list(pending.items()):
+                if future not in done:
                     continue
-                new_line.append(int(val))
-            aliquot_sequence_list.append(new_line)
-    with open("./aliquot_sequences/sequence_files/aliquot_sequence_length.txt", "r", encoding="utf-8") as f:
-        aliquot_sequence_length = []
-        for line in f:
-            aliquot_sequence_length.append(line.strip().replace("[","").replace("]","").split("-")[1:][0].split(","))
-        aliquot_sequence_length = [int(val) for l in aliquot_sequence_length for val in l]
-
-    return (
-        proper_divisor_lists,
-        proper_divisors_length,
-        aliquot_sums,
-        aliquot_sequence_list,
-        aliquot_sequence_length,
-    )
+                rows, elapsed, profile_report = future.result()
+                if profile_report is not None:
+                    profiler.merge(profile_report["timings"], profile_report["counters"])
+                del pending[chunk_start]
+                finished[chunk_start] = rows
+
+                chunk_rate = len(rows) / max(elapsed, 1e-6)
+                rows_per_second = chunk_rate if rows_per_second is None else (rows_per_second + chunk_rate) / 2
+                chunk_size = min(max(int(rows_per_second * chunk_seconds), min_chunk), max_chunk)
+
+            while next_write in finished:
+                records = finished.pop(next_write)
+                for record in records:
+                    writer.append(record.proper_divisors, record.al_sum, record.al_seq, record.al_seq_length)
+                next_write += len(records)
+                if profiler is not None:
+                    profiler.lap("write")
+                    profiler.advance(len(records))
+
+
+def animate_sequences(
+    directory: Path = SEQUENCE_FILES_DIR,
+    path: "Path | None" = None,
+    first: "int | None" = None,
+    last: "int | None" = None,
+    fps: int = 30,
+    trail: int = 8,
+    dpi: int = 80,
+) -> None:
+    """
+    Animate the stored aliquot sequences on a log scale, one n per frame, see sequence_animation.
+
+    Args:
+        directory (Path, optional): sequence store directory. Defaults to SEQUENCE_FILES_DIR.
+        path (Path, optional): stream the frames to a .gif file, or to a directory of PNG files. Defaults to
+            None, showing the animation in a window.
+        first (int, optional): first n to animate. Defaults to the first n in the store.
+        last (int, optional): last n to animate. Defaults to the last n in the store.
+        fps (int, optional): frames per second. Defaults to 30.
+        trail (int, optional): number of trajectories shown at once, fading with age. Defaults to 8.
+        dpi (int, optional): resolution of the 8x4.5 inch frames. Defaults to 80.
+    """
+    from sequence_animation import TrajectoryAnimation, frame_writer
+
+    store = open_sequence_files(directory)
+    first = store.first_n if first is None else first
+    last = store.first_n + len(store) - 1 if last is None else last
+    rows = range(first - store.first_n, last - store.first_n + 1)
+
+    color = "tab:blue"
+    animation = TrajectoryAnimation(store, rows, trail=trail, color=color, dpi=dpi, interactive=path is None)
+    if path is None:
+        animation.show(fps)
+    else:
+        animation.save(frame_writer(path, fps, colors=(color, "black")), path)
+
+
+def open_sequence_files(directory: Path = SEQUENCE_FILES_DIR) -> "SequenceStore":
+    """
+    Memory map the sequence store written by aliquot_sequence_sequences.
+
+    Divisor lists and sequences are SequenceTables, row i of which is a view of the values for n = first_n + i.
+
+    Stores from before the binary format can be converted once with sequence_store.convert_text_sequence_files.
+    """
+    from sequence_store import open_sequence_store
+
+    return open_sequence_store(directory)
 
 
 def plot_sequences(save: bool = False, show: bool = True) -> None:
-    (
-        proper_divisor_lists,
-        proper_divisors_length,
-        aliquot_sums,
-        aliquot_sequence_list,
-        aliquot_sequence_length,
-    ) = open_sequence_files()
-
-    # print(aliquot_sequence_length[:5])
-    # print(aliquot_sequence_list[:5])
-    # print(aliquot_sums[:5])
-    # print(proper_divisor_lists[:5])
-    # # print(proper_divisors_length[:5])
+    import matplotlib.pyplot as plt
+    import numpy as np
+
+    from divisor_sieve import proper_divisor_count_sieve, proper_divisor_frequencies
+
+    store = open_sequence_files()
+    aliquot_sums = store.aliquot_sums
+    aliquot_sequence_length = store.aliquot_sequence_length
+    aliquot_sequence_maxima = store.aliquot_sequence.maxima()
+    n_max = store.first_n + len(store) - 1
+    n_values = np.arange(store.first_n, n_max + 1)
+
+    # The divisor statistics only depend on the range of n, so they come from sieves and closed forms instead of
+    # the stored divisor lists, and scale to n in the 10^8s
+    proper_divisors_length = proper_divisor_count_sieve(n_max)[store.first_n:]
+    proper_divisor_frequency = proper_divisor_frequencies(n_max)
+    if store.first_n > 1:
+        below = proper_divisor_frequencies(store.first_n - 1)
+        proper_divisor_frequency[: len(below)] -= below
 
     plt.figure(figsize=(15,6))
-    plt.plot(aliquot_sequence_length)
+    plt.plot(n_values, aliquot_sequence_length)
     plt.title("Length of Aliquot Sequence (early cutoff at Length=100)")
     plt.xlabel("n")
     plt.ylabel("Length")
 
     plt.figure(figsize=(15,6))
-    plt.plot(aliquot_sums)
+    plt.plot(n_values, aliquot_sums)
     plt.title("Aliquot Sum")
     plt.xlabel("n")
     plt.ylabel("Sum")
 
     plt.figure(figsize=(15,6))
-    plt.plot(proper_divisors_length)
+    plt.semilogy(n_values, np.maximum(aliquot_sequence_maxima, 1))
+    plt.title("Largest Term of Aliquot Sequence (early cutoff at Length=100)")
+    plt.xlabel("n")
+    plt.ylabel("Largest Term")
+
+    plt.figure(figsize=(15,6))
+    plt.plot(n_values, proper_divisors_length)
     plt.title("Number of Proper Divisors of n")
     plt.xlabel("n")
     plt.ylabel("Number of Proper Divisors")
     plt.ylabel("Sum")
 
     plt.figure(figsize=(15,6))
-    plt.bar(x=range(len(proper_divisors_length)), height=proper_divisors_length)
+    plt.bar(x=n_values, height=proper_divisors_length)
     plt.title("Number of Proper Divisors of n")
     plt.xlabel("n")
     plt.ylabel("Number of Proper Divisors")
 
-    aliquot_sequence_length_counter = collections.Counter(aliquot_sequence_length)
+    aliquot_sequence_length_counts = np.bincount(aliquot_sequence_length)
     plt.figure(figsize=(15,6))
-    plt.bar(x=aliquot_sequence_length_counter.keys(), height=aliquot_sequence_length_counter.values())
-    plt.title("Count of Aliquot Sequence Lengths, for sequences of n <= 500 (early cutoff at Length=100)")
+    plt.bar(x=np.arange(len(aliquot_sequence_length_counts)), height=aliquot_sequence_length_counts)
+    plt.title(f"Count of Aliquot Sequence Lengths, for sequences of n <= {n_max} (early cutoff at Length=100)")
     plt.xlabel("Length of Aliquot Sequence")
     plt.ylabel("Length")
 
-    proper_divisors_length_counter = collections.Counter(proper_divisors_length)
+    proper_divisors_length_counts = np.bincount(proper_divisors_length)
     plt.figure(figsize=(15,6))
-    plt.bar(x=proper_divisors_length_counter.keys(), height=proper_divisors_length_counter.values())
-    plt.title("Count of Number of Proper Divisors of n, n <= 500")
+    plt.bar(x=np.arange(len(proper_divisors_length_counts)), height=proper_divisors_length_counts)
+    plt.title(f"Count of Number of Proper Divisors of n, n <= {n_max}")
     plt.xlabel("Number of Proper Divisors")
     plt.ylabel("Count")
 
     # number of occurrences of m in combined proper divisors of all n's approaches n/m as n approaches infinity
-    proper_divisor_lists_counter = collections.Counter(flatten(proper_divisor_lists))
     plt.figure(figsize=(15,6))
-    plt.bar(x=proper_divisor_lists_counter.keys(), height=proper_divisor_lists_counter.values())
-    plt.title("Frequency of Proper Divisors of n, n <= 500")
+    plt.bar(x=np.arange(1, len(proper_divisor_frequency)), height=proper_divisor_frequency[1:])
+    plt.title(f"Frequency of Proper Divisors of n, n <= {n_max}")
     plt.xlabel("Proper Divisor")
     plt.ylabel("Count")
 
@@ -320,12 +997,27 @@ def main() -> None:
     # al_sum = aliquot_sum(divisor_list)
     # print(al_sum)
 
-    # pbar = tqdm(unit=" step", leave=True)
+    # from progress import progress_bar
+    # pbar = progress_bar(unit=" step", leave=True)
     # seq = aliquot_sequence(input_val, allow_repetition=False, pbar=pbar)
     # print("\nn =", input_val)
     # print(seq)
     # print('length of sequence:', len(seq))
 
+    # from sequence_store import convert_text_sequence_files
+    # convert_text_sequence_files(SEQUENCE_FILES_DIR)
+
+    # benchmark_records(10**5)
+    # benchmark_backends()
+
+    # from work_queue import create_work_queue, merge_shards, run_local_workers
+    # create_work_queue(Path("./aliquot_sequences/work_queue"), 10**6)
+    # run_local_workers(Path("./aliquot_sequences/work_queue"))
+    # merge_shards(Path("./aliquot_sequences/work_queue"), SEQUENCE_FILES_DIR)
+
+    # from lookup_service import serve
+    # serve(SEQUENCE_FILES_DIR)
+
     # counter_start = perf_counter()
     # aliquot_sequence_sequences(500)
     # print(f"Elapsed time: {perf_counter() - counter_start}")
@@ -0,0 +1,76 @@
+"""
+Cycles of the aliquot map m -> s(m), found from a whole sum table at once.
+
+Restricted to 1..N, the aliquot map is a functional graph: every m has one successor, or none when s(m) = 0 or
+s(m) > N. Repeatedly removing every node that nothing points to leaves exactly the nodes on cycles, and each node
+is removed once, so this is linear in N however long the tails leading into the cycles are. The few nodes left
+are then walked once each to split them into cycles.
+
+Perfect numbers are the cycles of length 1, amicable pairs of length 2, and sociable numbers the longer ones.
+"""
+
+import numpy as np
+import numpy.typing as npt
+
+
+def cycle_members(successors: npt.NDArray[np.int64]) -> npt.NDArray[np.int64]:
+    """
+    Every node on a cycle of the functional graph m -> successors[m], in increasing order.
+
+    Nodes are 1..len(successors) - 1. A successor outside of that range, including 0, leaves the graph.
+    """
+    limit = len(successors) - 1
+    targets = np.where((successors >= 1) & (successors <= limit), successors, 0)
+    targets[0] = 0
+    in_degree = np.bincount(targets[1:], minlength=limit + 1)
+    on_cycle = np.ones(limit + 1, dtype=bool)
+    on_cycle[0] = False
+
+    removed = np.flatnonzero(in_degree[1:] == 0) + 1
+    while len(removed):
+        on_cycle[removed] = False
+        nodes, counts = np.unique(targets[removed], return_counts=True)
+        if nodes[0] == 0:
+            nodes, counts = nodes[1:], counts[1:]
+        in_degree[nodes] -= counts
+        removed = nodes[in_degree[nodes] == 0]
+
+    return np.flatnonzero(on_cycle)
+
+
+def functional_graph_cycles(successors: npt.NDArray[np.int64]) -> "list[tuple[int, ...]]":
+    """
+    Every cycle of the functional graph m -> successors[m], see cycle_members.
+
+    Each cycle is listed once, starting from its smallest member, and cycles are in increasing order of that
+    member.
+
+    Examples:
+    >>> functional_graph_cycles(np.array([0, 0, 3, 4, 2, 5, 7, 6, 2]))
+    [(2, 3, 4), (5,), (6, 7)]
+    """
+    cycles = []
+    visited = set()
+    for start in cycle_members(successors).tolist():
+        if start in visited:
+            continue
+        cycle = [start]
+        m = int(successors[start])
+        while m != start:
+            cycle.append(m)
+            m = int(successors[m])
+        visited.update(cycle)
+        cycles.append(tuple(cycle))
+    return cycles
+
+
+def aliquot_cycles(sum_table: npt.NDArray[np.int64]) -> "list[tuple[int, ...]]":
+    """
+    Every perfect number, amicable pair and sociable cycle with all of its members in a sum table of 0..N.
+
+    Examples:
+    >>> from divisor_sieve import aliquot_sum_sieve
+    >>> aliquot_cycles(aliquot_sum_sieve(1500))
+    [(6,), (28,), (220, 284), (496,), (1184, 1210)]
+    """
+    return functional_graph_cycles(sum_table)
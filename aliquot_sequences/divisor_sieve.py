@@ -0,0 +1,193 @@
+"""
+Sieve methods for divisor functions over a whole range of integers.
+
+sigma(n) is the sum of all positive divisors of n, and the aliquot sum is s(n) = sigma(n) - n.
+Instead of trial dividing every n separately, every d adds itself to each of its proper multiples,
+which fills a table for 1..N in O(N log N) additions.
+
+Windows far from 1, eg [10^11, 10^11 + 10^8), use a segmented sieve instead: every n in a segment is divided
+by the primes up to sqrt of the end of the window, and sigma is built up multiplicatively from the prime powers.
+"""
+
+from math import isqrt
+from typing import Iterator
+
+import numpy as np
+import numpy.typing as npt
+
+from factorization import primes_below
+
+
+# sigma(n) < 7n for n <= 10^18, so segmented sums still fit in int64
+SEGMENTED_SIEVE_LIMIT: int = 10**18
+
+
+def proper_divisor_pairs(limit: int) -> "Iterator[tuple[slice, int | npt.NDArray[np.int64]]]":
+    """
+    Every proper divisor d of every n <= limit, as strided slices over a table indexed by n.
+
+    n = k * d with k >= 2. Divisors up to sqrt(limit) each get one slice over their multiples, and the larger
+    divisors are grouped by k instead, one slice per k holding the whole run of d. That is O(sqrt(limit)) numpy
+    operations rather than one per divisor.
+
+    Yields:
+        tuple[slice, int | npt.NDArray[np.int64]]: positions n, and the divisor d of each of them
+    """
+    root = isqrt(limit)
+    for d in range(1, root + 1):
+        yield slice(2 * d, limit + 1, d), d
+    for k in range(2, limit // (root + 1) + 1):
+        yield slice(k * (root + 1), k * (limit // k) + 1, k), np.arange(root + 1, limit // k + 1, dtype=np.int64)
+
+
+def aliquot_sum_sieve(limit: int) -> npt.NDArray[np.int64]:
+    """
+    Table of aliquot sums for 0 <= n <= limit, such that table[n] == s(n).
+
+    table[0] is left as 0, it is only there so that n indexes the table directly.
+    s(n) < n * (1 + ln n), so values stay well inside int64 for any table that fits in memory.
+
+    Args:
+        limit (int): largest n in the table
+
+    Raises:
+        ValueError: if limit < 1.
+
+    Returns:
+        npt.NDArray[np.int64]: aliquot sum of every n up to limit
+
+    Examples:
+    >>> aliquot_sum_sieve(12).tolist()
+    [0, 0, 1, 1, 3, 1, 6, 1, 7, 4, 8, 1, 16]
+    """
+    if limit < 1:
+        raise ValueError("Must be a positive integer.")
+
+    table = np.zeros(limit + 1, dtype=np.int64)
+    for positions, d in proper_divisor_pairs(limit):
+        table[positions] += d
+
+    return table
+
+
+def proper_divisor_count_sieve(limit: int) -> npt.NDArray[np.uint16]:
+    """
+    Table of the number of proper divisors for 0 <= n <= limit, such that table[n] == d(n) - 1.
+
+    No n below 10^14 has more than 17280 divisors, so uint16 holds the count for any table that fits in memory.
+
+    Raises:
+        ValueError: if limit < 1.
+
+    Examples:
+    >>> proper_divisor_count_sieve(12).tolist()
+    [0, 0, 1, 1, 2, 1, 3, 1, 3, 2, 3, 1, 5]
+    """
+    if limit < 1:
+        raise ValueError("Must be a positive integer.")
+
+    table = np.zeros(limit + 1, dtype=np.uint16)
+    for positions, _ in proper_divisor_pairs(limit):
+        table[positions] += 1
+
+    return table
+
+
+def proper_divisor_count_histogram(limit: int) -> npt.NDArray[np.int64]:
+    """
+    How many n in 1..limit have exactly c proper divisors, indexed by c.
+
+    Examples:
+    >>> proper_divisor_count_histogram(12).tolist()
+    [1, 5, 2, 3, 0, 1]
+    """
+    return np.bincount(proper_divisor_count_sieve(limit)[1:])
+
+
+def proper_divisor_frequencies(limit: int) -> npt.NDArray[np.int64]:
+    """
+    How many n in 1..limit have m as a proper divisor, indexed by m.
+
+    m divides m, 2m, ..., (limit // m) * m and is a proper divisor of all of them but m itself, so this is just
+    limit // m - 1, and needs no divisor lists at all. Divisors above limit // 2 never occur and are left out.
+
+    Examples:
+    >>> proper_divisor_frequencies(12).tolist()
+    [0, 11, 5, 3, 2, 1, 1]
+    """
+    frequencies = np.zeros(limit // 2 + 1, dtype=np.int64)
+    frequencies[1:] = limit // np.arange(1, limit // 2 + 1, dtype=np.int64) - 1
+    return frequencies
+
+
+def segmented_aliquot_sums(
+    start: int, stop: int, segment_size: int = 1 << 20, divisor_counts: bool = False
+) -> "Iterator[tuple[int, npt.NDArray[np.int64], npt.NDArray[np.int64] | None]]":
+    """
+    Aliquot sums of every n in [start, stop), streamed one segment at a time.
+
+    Only the primes up to sqrt(stop) are kept, along with a few arrays of segment_size, so memory is bounded by
+    the segment size however far the window is from 1. Every n in the segment is divided by each prime as often
+    as it goes in, which gives sigma(n) = prod (1 + p + ... + p^e) over those primes. What is left after that
+    is 1 or a single prime above sqrt(stop).
+
+    Args:
+        start (int): first n
+        stop (int): end of the window, exclusive
+        segment_size (int, optional): number of n per segment. Defaults to 2**20.
+        divisor_counts (bool, optional): also yield the number of proper divisors of every n. Defaults to False.
+
+    Raises:
+        ValueError: if start < 1, or stop > SEGMENTED_SIEVE_LIMIT.
+
+    Yields:
+        tuple[int, npt.NDArray[np.int64], npt.NDArray[np.int64] | None]: first n of the segment, aliquot sums of
+            the segment, and its proper divisor counts if asked for
+
+    Examples:
+    >>> [(lo, sums.tolist(), counts.tolist()) for lo, sums, counts in segmented_aliquot_sums(6, 13, 4, True)]
+    [(6, [6, 1, 7, 4], [3, 1, 3, 2]), (10, [8, 1, 16], [3, 1, 5])]
+    """
+    if start < 1:
+        raise ValueError("Must be a positive integer.")
+    if stop > SEGMENTED_SIEVE_LIMIT:
+        raise ValueError(f"Segmented sieve only reaches {SEGMENTED_SIEVE_LIMIT}.")
+
+    primes = primes_below(isqrt(max(stop - 1, 0)) + 1)
+    for lo in range(start, stop, segment_size):
+        hi = min(lo + segment_size, stop)
+        n = np.arange(lo, hi, dtype=np.int64)
+        remaining = n.copy()
+        sigma = np.ones(hi - lo, dtype=np.int64)
+        counts = np.ones(hi - lo, dtype=np.int64) if divisor_counts else None
+
+        for p in primes:
+            first = -lo % p  # offset of the first multiple of p in the segment
+            if first >= hi - lo:
+                continue
+            multiples = remaining[first::p]
+            power_sum = np.ones_like(multiples)  # 1 + p + ... + p^e
+            power = np.ones_like(multiples)
+            exponent = np.zeros_like(multiples)
+            divisible = np.ones(len(multiples), dtype=bool)
+            while True:
+                divisible &= multiples % p == 0
+                if not divisible.any():
+                    break
+                multiples[divisible] //= p
+                power[divisible] *= p
+                power_sum[divisible] += power[divisible]
+                exponent[divisible] += 1
+            remaining[first::p] = multiples
+            sigma[first::p] *= power_sum
+            if counts is not None:
+                counts[first::p] *= exponent + 1
+
+        # at most one prime factor above sqrt(stop) is left
+        large_prime = remaining > 1
+        sigma[large_prime] *= remaining[large_prime] + 1
+        if counts is not None:
+            counts[large_prime] *= 2
+            counts -= 1
+
+        yield lo, sigma - n, counts
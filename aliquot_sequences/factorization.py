@@ -0,0 +1,263 @@
+"""
+Integer factorization for large aliquot sequence terms.
+
+Trial division up to sqrt(n) is hopeless once terms pass ~10^15, so n is factored instead: trial division by
+the primes below 1000, a Miller-Rabin primality test for what is left, and Pollard's rho with Brent's cycle
+detection to split composites. The divisor sum follows directly from the prime factorization,
+sigma(p1^e1 * ... * pk^ek) = prod (pi^(ei+1) - 1) / (pi - 1), and the full divisor list is only generated
+when it is actually needed.
+
+The big integer arithmetic goes through a backend: gmpy2 when it is installed, whose mpz multiplication and
+reduction, is_prime and isqrt are much faster than CPython ints once terms pass ~10^20, and pure Python otherwise.
+Both give identical factorizations, since factors are always returned as Python ints. Importing gmpy2 takes
+~100ms, so the backend is only chosen the first time a term needs more than trial division, or by set_backend.
+
+https://en.wikipedia.org/wiki/Miller%E2%80%93Rabin_primality_test
+https://en.wikipedia.org/wiki/Pollard%27s_rho_algorithm#Variants
+"""
+
+import math
+from itertools import count
+from typing import Callable, NamedTuple
+
+
+def primes_below(n: int) -> "list[int]":
+    """Primes p < n, by the sieve of Eratosthenes."""
+    sieve = bytearray([1]) * max(n, 2)
+    sieve[0] = sieve[1] = 0
+    for p in range(2, math.isqrt(max(n - 1, 0)) + 1):
+        if sieve[p]:
+            sieve[p * p :: p] = bytes(len(range(p * p, n, p)))
+    return [p for p in range(n) if sieve[p]]
+
+
+SMALL_PRIMES: "list[int]" = primes_below(1000)
+# Testing against the first 13 primes is deterministic for n < 3.3 * 10^24, and a strong probable prime test above
+MILLER_RABIN_BASES: "list[int]" = SMALL_PRIMES[:13]
+
+
+def miller_rabin(n: int) -> bool:
+    """
+    Miller-Rabin primality test.
+
+    Exact for n < 3317044064679887385961981, for larger n a composite passing every base is vanishingly unlikely.
+
+    Examples:
+    >>> [p for p in range(30) if miller_rabin(p)]
+    [2, 3, 5, 7, 11, 13, 17, 19, 23, 29]
+    >>> miller_rabin(2**61 - 1), miller_rabin(2**61 + 1)
+    (True, False)
+    """
+    if n < 2:
+        return False
+    for p in MILLER_RABIN_BASES:
+        if n % p == 0:
+            return n == p
+
+    d, s = n - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+
+    for a in MILLER_RABIN_BASES:
+        x = pow(a, d, n)
+        if x in (1, n - 1):
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+class ArithmeticBackend(NamedTuple):
+    """Big integer operations used by the factorization."""
+
+    name: str
+    mpz: "Callable[[int], int]"  # converts n to the backend integer type
+    is_prime: "Callable[[int], bool]"
+    isqrt: "Callable[[int], int]"
+    gcd: "Callable[[int, int], int]"
+
+
+PYTHON_BACKEND: ArithmeticBackend = ArithmeticBackend("python", int, miller_rabin, math.isqrt, math.gcd)
+
+_backends: "dict[str, ArithmeticBackend] | None" = None
+backend: "ArithmeticBackend | None" = None  # chosen on first use, see current_backend
+
+
+def available_backends() -> "dict[str, ArithmeticBackend]":
+    """Arithmetic backends by name, "python" and "gmpy2" if it is installed. gmpy2 is imported on the first call."""
+    global _backends
+    if _backends is None:
+        _backends = {PYTHON_BACKEND.name: PYTHON_BACKEND}
+        try:
+            import gmpy2
+        except ImportError:  # optional, the pure Python backend is used instead
+            pass
+        else:
+            # gmpy2.is_prime is a BPSW test followed by 25 Miller-Rabin rounds with random bases
+            _backends["gmpy2"] = ArithmeticBackend(
+                "gmpy2", gmpy2.mpz, lambda n: bool(gmpy2.is_prime(n, 25)), gmpy2.isqrt, gmpy2.gcd
+            )
+    return _backends
+
+
+def current_backend() -> ArithmeticBackend:
+    """The arithmetic backend of this process, gmpy2 if it is installed unless set_backend chose otherwise."""
+    global backend
+    if backend is None:
+        backend = available_backends().get("gmpy2", PYTHON_BACKEND)
+    return backend
+
+
+def set_backend(name: str) -> ArithmeticBackend:
+    """
+    Switch the arithmetic backend of this process to "python" or "gmpy2", and return the previous one.
+
+    Raises:
+        ValueError: if the backend is unknown, or is gmpy2 and gmpy2 isn't installed.
+    """
+    global backend
+    backends = available_backends()
+    if name not in backends:
+        raise ValueError(f"Arithmetic backend {name!r} isn't available, choose from {list(backends)}.")
+    previous, backend = current_backend(), backends[name]
+    return previous
+
+
+def is_probable_prime(n: int) -> bool:
+    """
+    Primality test of the current backend, miller_rabin or gmpy2.is_prime.
+
+    Examples:
+    >>> [p for p in range(30) if is_probable_prime(p)]
+    [2, 3, 5, 7, 11, 13, 17, 19, 23, 29]
+    >>> is_probable_prime(2**61 - 1), is_probable_prime(2**61 + 1)
+    (True, False)
+    """
+    return (backend or current_backend()).is_prime(n)
+
+
+def pollard_brent(n: int) -> int:
+    """
+    A nontrivial factor of an odd composite n, by Pollard's rho with Brent's cycle detection.
+
+    Products of |x - y| are accumulated m at a time so there is one gcd per m steps. The walk is deterministic,
+    x -> x^2 + c starting from 2, with c = 1, 2, ... until a proper factor is found.
+    """
+    if n % 2 == 0:
+        return 2
+
+    arithmetic = backend or current_backend()
+    n, gcd = arithmetic.mpz(n), arithmetic.gcd
+    m = 128
+    for c in count(1):
+        y, r, q, g = 2, 1, 1, 1
+        x = ys = y
+        while g == 1:
+            x = y
+            for _ in range(r):
+                y = (y * y + c) % n
+            k = 0
+            while k < r and g == 1:
+                ys = y
+                for _ in range(min(m, r - k)):
+                    y = (y * y + c) % n
+                    q = q * abs(x - y) % n
+                g = gcd(q, n)
+                k += m
+            r *= 2
+
+        if g == n:
+            # the batched product overshot, step back through the last batch one gcd at a time
+            g = 1
+            while g == 1:
+                ys = (ys * ys + c) % n
+                g = gcd(abs(x - ys), n)
+        if g != n:
+            return int(g)
+    raise AssertionError("unreachable")
+
+
+def factorize(n: int) -> "dict[int, int]":
+    """
+    Prime factorization of n as {prime: exponent}, in increasing order of primes.
+
+    Raises:
+        ValueError: if n < 1.
+
+    Examples:
+    >>> factorize(1)
+    {}
+    >>> factorize(360)
+    {2: 3, 3: 2, 5: 1}
+    >>> factorize(2**61 - 1)
+    {2305843009213693951: 1}
+    >>> factorize(1000000007 * 998244353)
+    {998244353: 1, 1000000007: 1}
+    """
+    if n < 1:
+        raise ValueError("Must be a positive integer.")
+
+    factors = {}
+    for p in SMALL_PRIMES:
+        if p * p > n:
+            break
+        while n % p == 0:
+            factors[p] = factors.get(p, 0) + 1
+            n //= p
+
+    # n has no prime factor below 1000 left, so if it's below 1000^2 it is 1 or prime
+    composites = [n] if n > 1 else []
+    while composites:
+        m = composites.pop()
+        if m < SMALL_PRIMES[-1] ** 2 or is_probable_prime(m):
+            factors[m] = factors.get(m, 0) + 1
+            continue
+        # rho needs about sqrt(p) steps either way, but a square splits at once
+        root = int((backend or current_backend()).isqrt(m))
+        d = root if root * root == m else pollard_brent(m)
+        composites.extend((d, m // d))
+
+    return dict(sorted(factors.items()))
+
+
+def sigma_from_factors(factors: "dict[int, int]") -> int:
+    """Sum of all divisors of the number with the given prime factorization."""
+    sigma = 1
+    for p, e in factors.items():
+        sigma *= (p ** (e + 1) - 1) // (p - 1)
+    return sigma
+
+
+def divisors_from_factors(factors: "dict[int, int]") -> "list[int]":
+    """Sorted list of all divisors of the number with the given prime factorization."""
+    divisors = [1]
+    for p, e in factors.items():
+        divisors = [d * p**k for d in divisors for k in range(e + 1)]
+    return sorted(divisors)
+
+
+def aliquot_sum_factored(n: int) -> int:
+    """
+    The aliquot sum s(n) = sigma(n) - n, from the prime factorization of n.
+
+    Examples:
+    >>> [aliquot_sum_factored(n) for n in (1, 6, 12, 220, 284)]
+    [0, 6, 16, 284, 220]
+    """
+    return sigma_from_factors(factorize(n)) - n
+
+
+def proper_divisors_factored(n: int) -> "list[int]":
+    """
+    Sorted proper divisors of n, from the prime factorization of n.
+
+    Examples:
+    >>> proper_divisors_factored(12)
+    [1, 2, 3, 4, 6]
+    """
+    return divisors_from_factors(factorize(n))[:-1]
@@ -0,0 +1,232 @@
+"""
+Local HTTP lookup service for aliquot results, and its client.
+
+    GET  /aliquot?n=138             result for one n
+    POST /aliquot/batch {"n": [...]} results for many n, in the order asked
+    GET  /stats                     cache and source counters
+
+A result is {"n", "aliquot_sum", "sequence", "classification", "period", "prime", "source"}. n within the
+memory mapped sequence store are answered from it ("store"), anything else is computed on the fly ("computed").
+The store doesn't keep classifications, so a stored sequence is classified by taking one more step from its last
+term: a repeat means a cycle, 0 means it terminated, anything else means it hit the iteration cutoff. Results are
+kept in a bounded LRU either way, so hot n cost a dict lookup.
+
+The server is the standard library's ThreadingHTTPServer speaking HTTP/1.1, and the client keeps one connection
+open with Nagle's algorithm off on both ends, so a lookup costs one round trip and no connection setup.
+"""
+
+import http.client
+import json
+import socket
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+from aliquot_sequences import aliquot_sequence_classified
+
+
+DEFAULT_PORT: int = 8470
+MAX_BATCH: int = 10**4
+
+
+class AliquotLookup:
+    """
+    Aliquot results for any n, from a sequence store where it has them, with a bounded LRU of recent results.
+
+    Args:
+        directory (Path, optional): sequence store directory. Defaults to None, computing everything.
+        max_entries (int, optional): most results kept in the LRU. Defaults to 10**5.
+        seq_iteration_cutoff (int, optional): An iteration bound for computed sequences. Defaults to 100.
+    """
+
+    def __init__(self, directory: "Path | None" = None, max_entries: int = 10**5, seq_iteration_cutoff: int = 100):
+        from sequence_store import META_FILENAME, open_sequence_store
+
+        self.store = None
+        if directory is not None and directory.joinpath(META_FILENAME).exists():
+            self.store = open_sequence_store(directory)
+        self.max_entries = max_entries
+        self.seq_iteration_cutoff = seq_iteration_cutoff
+        self.counters = {"hits": 0, "misses": 0, "evictions": 0, "store": 0, "computed": 0}
+        self._results: "OrderedDict[int, dict]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def lookup(self, n: int) -> dict:
+        """
+        Result for n.
+
+        Raises:
+            ValueError: if n < 1.
+        """
+        if n < 1:
+            raise ValueError("Must be a positive integer.")
+        with self._lock:
+            result = self._results.get(n)
+            if result is not None:
+                self._results.move_to_end(n)
+                self.counters["hits"] += 1
+                return result
+            self.counters["misses"] += 1
+
+        # computed outside the lock, two threads missing on the same n at once just both compute it
+        result = self._from_store(n) if self.store is not None else None
+        if result is None:
+            result = self._computed(n)
+        with self._lock:
+            self.counters[result["source"]] += 1
+            self._results[n] = result
+            if len(self._results) > self.max_entries:
+                self._results.popitem(last=False)
+                self.counters["evictions"] += 1
+        return result
+
+    def lookup_many(self, ns: "list[int]") -> "list[dict]":
+        """
+        Results for every n in ns, in order.
+
+        Raises:
+            ValueError: if there are more than MAX_BATCH of them, or one is < 1.
+        """
+        if len(ns) > MAX_BATCH:
+            raise ValueError(f"At most {MAX_BATCH} n per batch.")
+        return [self.lookup(n) for n in ns]
+
+    def _from_store(self, n: int) -> "dict | None":
+        row = n - self.store.first_n
+        if not 0 <= row < len(self.store):
+            return None
+        al_seq = self.store.sequence(row)
+        # one more step from the last stored term tells how the sequence ends
+        classified = aliquot_sequence_classified(n, seq_iteration_cutoff=len(al_seq) + 1, al_seq=al_seq)
+        return result_dict(n, int(self.store.aliquot_sums[row]), al_seq, classified, "store")
+
+    def _computed(self, n: int) -> dict:
+        classified = aliquot_sequence_classified(n, seq_iteration_cutoff=self.seq_iteration_cutoff)
+        return result_dict(n, classified.sequence[0], classified.sequence, classified, "computed")
+
+
+def result_dict(n: int, al_sum: int, al_seq: "list[int]", classified, source: str) -> dict:
+    return {
+        "n": n,
+        "aliquot_sum": al_sum,
+        "sequence": al_seq,
+        "classification": classified.classification,
+        "period": classified.period,
+        "prime": classified.prime,
+        "source": source,
+    }
+
+
+class LookupRequestHandler(BaseHTTPRequestHandler):
+    """JSON endpoints over server.lookup, an AliquotLookup."""
+
+    protocol_version = "HTTP/1.1"
+    # headers and body are separate writes, with Nagle's algorithm each response would wait on a delayed ACK
+    disable_nagle_algorithm = True
+
+    def do_GET(self) -> None:
+        url = urlsplit(self.path)
+        if url.path == "/aliquot":
+            try:
+                n = int(parse_qs(url.query)["n"][0])
+                self.send_json(200, self.server.lookup.lookup(n))
+            except (KeyError, ValueError) as e:
+                self.send_json(400, {"error": f"Expected /aliquot?n=<positive integer>: {e}"})
+        elif url.path == "/stats":
+            self.send_json(200, self.server.lookup.counters)
+        else:
+            self.send_json(404, {"error": f"Unknown path {url.path}."})
+
+    def do_POST(self) -> None:
+        if urlsplit(self.path).path != "/aliquot/batch":
+            self.send_json(404, {"error": f"Unknown path {self.path}."})
+            return
+        try:
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+            ns = [int(n) for n in body["n"]]
+            self.send_json(200, {"results": self.server.lookup.lookup_many(ns)})
+        except (KeyError, TypeError, ValueError) as e:
+            self.send_json(400, {"error": f'Expected {{"n": [positive integers]}}: {e}'})
+
+    def send_json(self, status: int, payload: dict) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+def make_server(
+    lookup: AliquotLookup, host: str = "127.0.0.1", port: int = DEFAULT_PORT, verbose: bool = False
+) -> ThreadingHTTPServer:
+    """A lookup server bound to host:port, not serving yet. Port 0 picks a free port."""
+    server = ThreadingHTTPServer((host, port), LookupRequestHandler)
+    server.daemon_threads = True
+    server.lookup = lookup
+    server.verbose = verbose
+    return server
+
+
+def serve(
+    directory: "Path | None" = None,
+    host: str = "127.0.0.1",
+    port: int = DEFAULT_PORT,
+    max_entries: int = 10**5,
+    seq_iteration_cutoff: int = 100,
+) -> None:
+    """Serve lookups from the sequence store in directory until interrupted."""
+    with make_server(AliquotLookup(directory, max_entries, seq_iteration_cutoff), host, port, verbose=True) as server:
+        print(f"Serving aliquot lookups on http://{host}:{server.server_port}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+class AliquotClient:
+    """
+    Client of the lookup service, over one kept alive connection. Not thread safe, use one client per thread.
+
+    Raises:
+        LookupError: from lookup and lookup_many, if the server rejects the request.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = DEFAULT_PORT, timeout: float = 30.0):
+        self.connection = http.client.HTTPConnection(host, port, timeout=timeout)
+        self.connection.connect()
+        self.connection.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def _request(self, method: str, path: str, payload: "dict | None" = None) -> dict:
+        body = None if payload is None else json.dumps(payload).encode("utf-8")
+        headers = {} if body is None else {"Content-Type": "application/json"}
+        self.connection.request(method, path, body=body, headers=headers)
+        response = self.connection.getresponse()
+        result = json.loads(response.read())
+        if response.status != 200:
+            raise LookupError(result.get("error", f"HTTP {response.status}"))
+        return result
+
+    def lookup(self, n: int) -> dict:
+        return self._request("GET", f"/aliquot?n={n}")
+
+    def lookup_many(self, ns: "list[int]") -> "list[dict]":
+        return self._request("POST", "/aliquot/batch", {"n": list(ns)})["results"]
+
+    def stats(self) -> dict:
+        return self._request("GET", "/stats")
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def __enter__(self) -> "AliquotClient":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
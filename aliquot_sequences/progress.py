@@ -0,0 +1,153 @@
+"""
+Optional progress bars, and lightweight profiling of sweeps.
+
+tqdm is only imported when a bar is made, and isn't required: without it, progress_bar returns a bar that shows
+nothing, so batch jobs neither need tqdm installed nor pay for importing it.
+
+A sweep runs millions of cheap rows, so it can't afford a bar update per row, let alone per sequence term.
+SweepProfiler counts rows and times stages with one perf_counter call per stage, and only touches the bar when
+display_interval has passed. Code that takes a profiler does nothing at all when it is None.
+"""
+
+import json
+from pathlib import Path
+from time import perf_counter
+from typing import Iterable, Iterator, Protocol
+
+
+class ProgressBar(Protocol):
+    """The part of the tqdm interface that the aliquot code uses."""
+
+    def update(self, n: int = 1) -> object:
+        ...
+
+    def set_postfix_str(self, s: str = "", refresh: bool = True) -> None:
+        ...
+
+    def close(self) -> None:
+        ...
+
+
+class NullProgressBar:
+    """A progress bar that shows nothing, in place of tqdm."""
+
+    def __init__(self, iterable: "Iterable | None" = None, **kwargs):
+        self.iterable = iterable
+
+    def __iter__(self) -> Iterator:
+        return iter(self.iterable)
+
+    def update(self, n: int = 1) -> None:
+        pass
+
+    def set_postfix_str(self, s: str = "", refresh: bool = True) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+def progress_bar(iterable: "Iterable | None" = None, **kwargs) -> ProgressBar:
+    """
+    A tqdm progress bar if tqdm is installed, otherwise a NullProgressBar.
+
+    Args:
+        iterable (Iterable, optional): iterable to wrap. Defaults to None, for a bar updated by hand.
+        **kwargs: passed on to tqdm
+    """
+    try:
+        from tqdm import tqdm
+    except ImportError:
+        return NullProgressBar(iterable)
+    return tqdm(iterable, **kwargs)
+
+
+class SweepProfiler:
+    """
+    Row and event counters and cumulative per-stage timings of a sweep, with a throttled progress display.
+
+    Stages are timed as laps: lap(stage) charges the time since the previous lap to stage, so timing k stages
+    in a row costs k perf_counter calls and nothing else. advance counts finished rows, and updates the display
+    only if display_interval seconds have passed since the last update, using the time of the last lap.
+
+    Args:
+        total (int, optional): last row of the sweep, for the display. Defaults to None.
+        initial (int, optional): rows already done before the sweep, eg when resuming. Defaults to 0.
+        display (bool, optional): show a progress bar, see progress_bar. Defaults to True.
+        display_interval (float, optional): least seconds between display updates. Defaults to 0.5.
+    """
+
+    def __init__(
+        self, total: "int | None" = None, initial: int = 0, display: bool = True, display_interval: float = 0.5
+    ):
+        self.rows = 0
+        self.counters: "dict[str, int]" = {}
+        self.timings: "dict[str, float]" = {}
+        self.display_interval = display_interval
+        self._bar = progress_bar(initial=initial, total=total, ascii=" ░▒█", ncols=100) if display else None
+        self._displayed_rows = 0
+        self._started = self._last = self._last_display = perf_counter()
+
+    def lap(self, stage: str) -> None:
+        """Charge the time since the previous lap to stage."""
+        now = perf_counter()
+        self.timings[stage] = self.timings.get(stage, 0.0) + now - self._last
+        self._last = now
+
+    def count(self, counter: str, n: int = 1) -> None:
+        self.counters[counter] = self.counters.get(counter, 0) + n
+
+    def advance(self, rows: int = 1) -> None:
+        """Count finished rows, and update the display if it is due."""
+        self.rows += rows
+        if self._bar is not None and self._last - self._last_display >= self.display_interval:
+            self.refresh()
+
+    def merge(self, timings: "dict[str, float]", counters: "dict[str, int] | None" = None) -> None:
+        """Add the timings and counters of another profiler, eg of a sweep worker."""
+        for stage, seconds in timings.items():
+            self.timings[stage] = self.timings.get(stage, 0.0) + seconds
+        for counter, n in (counters or {}).items():
+            self.count(counter, n)
+
+    def stage_summary(self) -> str:
+        """Share of the timed total spent in every stage, largest first."""
+        total = sum(self.timings.values()) or 1.0
+        stages = sorted(self.timings.items(), key=lambda item: -item[1])
+        return " ".join(f"{stage} {seconds / total:.0%}" for stage, seconds in stages)
+
+    def refresh(self) -> None:
+        """Update the display now."""
+        self._last_display = perf_counter()
+        if self._bar is not None:
+            self._bar.update(self.rows - self._displayed_rows)
+            self._bar.set_postfix_str(self.stage_summary(), refresh=False)
+            self._displayed_rows = self.rows
+
+    def report(self) -> dict:
+        """Rows, counters, stage timings and throughput so far."""
+        elapsed = perf_counter() - self._started
+        return {
+            "rows": self.rows,
+            "elapsed": elapsed,
+            "rows_per_second": self.rows / elapsed if elapsed > 0 else None,
+            "counters": dict(self.counters),
+            "timings": dict(sorted(self.timings.items(), key=lambda item: -item[1])),
+        }
+
+    def write_report(self, path: Path) -> None:
+        """Write report() to path as JSON."""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.report(), f, indent=2)
+
+    def close(self) -> None:
+        if self._bar is not None:
+            self.refresh()
+            self._bar.close()
+            self._bar = None
+
+    def __enter__(self) -> "SweepProfiler":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
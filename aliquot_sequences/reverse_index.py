@@ -0,0 +1,170 @@
+"""
+Reverse aliquot index: every m <= N with s(m) = n, for each n.
+
+The index is built straight from the aliquot sum table of the sieve pass, and stored in the same CSR layout as
+the list columns of the sequence store: a values file with the preimages of every n concatenated in increasing
+order, and an offsets file where the preimages of n are values[offsets[n]:offsets[n + 1]]. A lookup is two
+offset reads into a memory map, whatever the size of the index.
+
+A composite m has a prime factor p <= sqrt(m), so s(m) >= 1 + m / p >= 1 + sqrt(m), and primes all map to 1.
+Every preimage of n > 1 is therefore at most (n - 1)^2, and an index of 1..N has the complete preimages of every
+n in 2..isqrt(N) + 1. n with no preimage at all are the untouchable numbers.
+
+https://en.wikipedia.org/wiki/Untouchable_number
+"""
+
+import json
+from math import isqrt
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+import numpy.typing as npt
+
+from divisor_sieve import aliquot_sum_sieve
+from sequence_store import OFFSET_DTYPE, VALUE_DTYPE, memory_map, offsets_path, values_path
+
+
+INDEX_FORMAT: int = 1
+INDEX_META_FILENAME: str = "reverse_index.json"
+INDEX_COLUMN: str = "preimages"
+
+
+class ReverseAliquotIndex(NamedTuple):
+    """
+    Memory mapped preimages of every aliquot sum n <= limit, over the starting values m <= limit.
+
+    Only n <= complete_below have all of their preimages in the index, see the module docstring.
+    """
+
+    limit: int
+    offsets: npt.NDArray[np.int64]
+    values: npt.NDArray[np.uint64]
+
+    @property
+    def complete_below(self) -> int:
+        """Largest n whose preimages are all <= limit."""
+        return isqrt(self.limit) + 1
+
+    def preimages(self, n: int) -> npt.NDArray[np.uint64]:
+        """
+        Every m <= limit with s(m) = n, in increasing order. A view into the index, nothing is copied.
+
+        Raises:
+            IndexError: if n is negative or above limit.
+        """
+        if not 0 <= n <= self.limit:
+            raise IndexError(f"n = {n} is outside the index, 0 <= n <= {self.limit}.")
+        return self.values[self.offsets[n] : self.offsets[n + 1]]
+
+    def preimage_counts(self) -> npt.NDArray[np.int64]:
+        """Number of preimages of every n <= limit, indexed by n."""
+        return np.diff(self.offsets)
+
+    def untouchable_numbers(self, bound: "int | None" = None) -> npt.NDArray[np.int64]:
+        """
+        Untouchable numbers 2 <= n < bound, ie n that are not the aliquot sum of any m.
+
+        Raises:
+            ValueError: if bound is above complete_below + 1, the index can't rule out preimages above limit there.
+        """
+        if bound is None:
+            bound = self.complete_below + 1
+        if bound > self.complete_below + 1:
+            raise ValueError(f"Index up to {self.limit} only decides n <= {self.complete_below}.")
+        return np.flatnonzero(self.preimage_counts()[2:bound] == 0) + 2
+
+
+def reverse_index_arrays(
+    sum_table: npt.NDArray[np.int64],
+) -> "tuple[npt.NDArray[np.int64], npt.NDArray[np.uint64]]":
+    """
+    CSR offsets and values of the reverse index, from an aliquot sum table of 0..N as made by aliquot_sum_sieve.
+
+    Sums above N are left out. A stable sort by sum keeps the preimages of each n in increasing order.
+
+    Examples:
+    >>> offsets, values = reverse_index_arrays(aliquot_sum_sieve(12))
+    >>> [values[offsets[n] : offsets[n + 1]].tolist() for n in range(9)]
+    [[1], [2, 3, 5, 7, 11], [], [4], [9], [], [6], [8], [10]]
+    """
+    limit = len(sum_table) - 1
+    m = np.arange(1, limit + 1, dtype=np.int64)
+    sums = sum_table[1:]
+    in_range = sums <= limit
+    m, sums = m[in_range], sums[in_range]
+
+    order = np.argsort(sums, kind="stable")
+    offsets = np.zeros(limit + 2, dtype=OFFSET_DTYPE)
+    np.cumsum(np.bincount(sums, minlength=limit + 1), out=offsets[1:])
+    return offsets, m[order].astype(VALUE_DTYPE)
+
+
+def build_reverse_index(
+    limit: int, directory: Path, sum_table: "npt.NDArray[np.int64] | None" = None
+) -> ReverseAliquotIndex:
+    """
+    Write the reverse index of the starting values 1..limit to directory, and open it.
+
+    Args:
+        limit (int): largest m in the index. Preimages are complete for n <= isqrt(limit) + 1.
+        directory (Path): where to write the index, may be the directory of a sequence store.
+        sum_table (npt.NDArray[np.int64], optional): aliquot sums of 0..limit, if the sieve pass already made
+            them. Defaults to None, sieving them here.
+
+    Raises:
+        ValueError: if sum_table doesn't cover exactly 0..limit.
+    """
+    if sum_table is None:
+        sum_table = aliquot_sum_sieve(limit)
+    if len(sum_table) != limit + 1:
+        raise ValueError(f"Sum table covers 0..{len(sum_table) - 1}, expected 0..{limit}.")
+
+    offsets, values = reverse_index_arrays(sum_table)
+    directory.mkdir(parents=True, exist_ok=True)
+    offsets.tofile(offsets_path(directory, INDEX_COLUMN))
+    values.tofile(values_path(directory, INDEX_COLUMN))
+    with open(directory.joinpath(INDEX_META_FILENAME), "w", encoding="utf-8") as f:
+        json.dump({"format": INDEX_FORMAT, "limit": limit}, f)
+
+    return open_reverse_index(directory)
+
+
+def open_reverse_index(directory: Path) -> ReverseAliquotIndex:
+    """
+    Memory map a reverse index written by build_reverse_index.
+
+    Raises:
+        FileNotFoundError: if there is no index in directory.
+        ValueError: if the index format is unknown or its offsets don't match its values.
+    """
+    with open(directory.joinpath(INDEX_META_FILENAME), "r", encoding="utf-8") as f:
+        meta = json.load(f)
+    if meta["format"] != INDEX_FORMAT:
+        raise ValueError(f"Unknown reverse index format: {meta['format']}.")
+
+    offsets = memory_map(offsets_path(directory, INDEX_COLUMN), OFFSET_DTYPE)
+    values = memory_map(values_path(directory, INDEX_COLUMN), VALUE_DTYPE)
+    if len(offsets) != meta["limit"] + 2 or offsets[-1] != len(values):
+        raise ValueError(f"Reverse index offsets don't match {len(values)} preimages up to {meta['limit']}.")
+
+    return ReverseAliquotIndex(limit=meta["limit"], offsets=offsets, values=values)
+
+
+def untouchable_numbers(bound: int, directory: "Path | None" = None) -> npt.NDArray[np.int64]:
+    """
+    Untouchable numbers 2 <= n < bound, from a reverse index of 1..(bound - 2)^2.
+
+    Args:
+        bound (int): exclusive upper bound on n
+        directory (Path, optional): also keep the index in directory. Defaults to None, building it in memory.
+
+    Examples:
+    >>> untouchable_numbers(150).tolist()
+    [2, 5, 52, 88, 96, 120, 124, 146]
+    """
+    limit = max(bound - 2, 2) ** 2
+    if directory is not None:
+        return build_reverse_index(limit, directory).untouchable_numbers(bound)
+    offsets, values = reverse_index_arrays(aliquot_sum_sieve(limit))
+    return ReverseAliquotIndex(limit, offsets, values).untouchable_numbers(bound)
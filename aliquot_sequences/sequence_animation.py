@@ -0,0 +1,227 @@
+"""
+Animation of stored aliquot sequences, one starting value n per frame.
+
+Every frame shows the trajectory n, s(n), s(s(n)), ... on a log scale, with the trajectories of the previous few n
+fading out behind it. Terms too large for the store's uint64 values are taken exactly from its big terms, and only
+a term beyond the float range, which has no place on the axes, cuts a trajectory short. The axes are fixed from the
+vectorized maxima and lengths of the whole range up front, so the static parts of the figure are drawn once and every frame only blits the few reused line artists and the
+label onto a copy of that background.
+
+Frames are streamed to the output as they are rendered, and never kept: a GIF is written through Pillow's frame
+encoder against a fixed palette (Image.save would first collect every frame), and PNG frames go to one file each.
+Memory is bounded by one frame, however many n are animated.
+"""
+
+from pathlib import Path
+from typing import Iterable
+
+import matplotlib.pyplot as plt
+import numpy as np
+import numpy.typing as npt
+from matplotlib.animation import AbstractMovieWriter, FuncAnimation
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.colors import to_rgb
+from matplotlib.figure import Figure
+from PIL import GifImagePlugin, Image
+
+from sequence_store import BIG_TERM, SequenceStore
+
+
+def blend_palette(colors: "Iterable[str]") -> Image.Image:
+    """
+    A 256 color palette of ramps from white to each of the colors.
+
+    Everything the animation draws is one of its colors blended over white by alpha and antialiasing, so the
+    ramps cover every pixel far better than an adaptive palette of whichever frame happens to come first.
+    """
+    rgbs = [np.array(to_rgb(color)) for color in colors]
+    steps = 256 // len(rgbs)
+    palette = []
+    for rgb in rgbs:
+        for t in np.linspace(0, 1, steps):
+            palette.extend(int(round(255 * (1 - t * (1 - c)))) for c in rgb)
+    palette.extend([0] * (768 - len(palette)))
+
+    image = Image.new("P", (1, 1))
+    image.putpalette(palette)
+    return image
+
+
+class FrameWriter(AbstractMovieWriter):
+    """
+    Base of the streaming writers. grab_frame takes the canvas buffer as it is, so frames drawn by blitting are
+    written without redrawing the figure.
+    """
+
+    def setup(self, fig, outfile, dpi=None):
+        super().setup(fig, outfile, dpi)
+        self.frames = 0
+
+    def frame_image(self) -> Image.Image:
+        return Image.fromarray(np.asarray(self.fig.canvas.buffer_rgba())[..., :3])
+
+
+class StreamingGifWriter(FrameWriter):
+    """
+    Writes a looping GIF one frame at a time, quantized to a fixed palette, see blend_palette.
+
+    Args:
+        fps (int, optional): frames per second. Defaults to 30.
+        colors (Iterable[str], optional): colors the palette is built from. Defaults to black.
+    """
+
+    def __init__(self, fps: int = 30, colors: "Iterable[str]" = ("black",)):
+        super().__init__(fps=fps)
+        self.palette = blend_palette(colors)
+        self._file = None
+
+    def setup(self, fig, outfile, dpi=None):
+        super().setup(fig, outfile, dpi)
+        self._file = open(outfile, "wb")
+
+    def grab_frame(self, **savefig_kwargs):
+        frame = self.frame_image().quantize(palette=self.palette, dither=Image.Dither.NONE)
+        duration = 1000 / self.fps
+        if self.frames == 0:
+            header, _ = GifImagePlugin.getheader(frame, info={"loop": 0, "duration": duration})
+            self._file.write(b"".join(header))
+        self._file.write(b"".join(GifImagePlugin.getdata(frame, duration=duration)))
+        self.frames += 1
+
+    def finish(self):
+        self._file.write(b";")  # GIF trailer
+        self._file.close()
+
+
+class PngFrameWriter(FrameWriter):
+    """Writes every frame to outfile/00000.png, outfile/00001.png, ..."""
+
+    def setup(self, fig, outfile, dpi=None):
+        super().setup(fig, outfile, dpi)
+        Path(outfile).mkdir(parents=True, exist_ok=True)
+
+    def grab_frame(self, **savefig_kwargs):
+        self.frame_image().save(Path(self.outfile).joinpath(f"{self.frames:05d}.png"), compress_level=1)
+        self.frames += 1
+
+    def finish(self):
+        pass
+
+
+def float_terms(terms: "list[int]") -> npt.NDArray[np.float64]:
+    """Terms as floats, inf for those beyond the float range."""
+    return np.array([float(term) if term.bit_length() <= 1023 else np.inf for term in terms], dtype=np.float64)
+
+
+class TrajectoryAnimation:
+    """
+    Figure and reused artists for animating the aliquot sequences of a sequence store.
+
+    Args:
+        store (SequenceStore): sweep results, row i for n = store.first_n + i
+        rows (range): rows to animate, one per frame
+        trail (int, optional): number of trajectories shown at once, fading with age. Defaults to 8.
+        color (str, optional): line color. Defaults to "tab:blue".
+        figsize (tuple[float, float], optional): figure size in inches. Defaults to (8, 4.5).
+        dpi (int, optional): figure dpi. Defaults to 80.
+        interactive (bool, optional): make a pyplot figure that can be shown, rather than an off screen Agg
+            figure for saving. Defaults to False.
+    """
+
+    def __init__(
+        self,
+        store: SequenceStore,
+        rows: range,
+        trail: int = 8,
+        color: str = "tab:blue",
+        figsize: "tuple[float, float]" = (8, 4.5),
+        dpi: int = 80,
+        interactive: bool = False,
+    ):
+        self.store = store
+        self.first_n = first_n = store.first_n
+        self.rows = rows
+        self.color = color
+
+        window = store.aliquot_sequence[rows.start : rows.stop]
+        # a row holding a big term has BIG_TERM as its maximum, the big terms themselves give the real one
+        maxima = window.maxima()
+        big = float_terms([term for _, term in store.big_terms.between(int(window.offsets[0]), int(window.offsets[-1]))])
+        largest = max(
+            float(maxima[maxima != BIG_TERM].max(initial=0)),
+            float(big[np.isfinite(big)].max(initial=0)),
+            float(first_n + rows.stop - 1),
+            2.0,
+        )
+        longest = int(window.lengths().max(initial=0)) + 1
+
+        if interactive:
+            self.fig = plt.figure(figsize=figsize, dpi=dpi)
+        else:
+            self.fig = Figure(figsize=figsize, dpi=dpi)
+            FigureCanvasAgg(self.fig)
+        self.ax = self.fig.add_subplot()
+        self.ax.set_yscale("log")
+        self.ax.set_xlim(0, max(longest, 2))
+        self.ax.set_ylim(1, largest * 2)
+        self.ax.set_xlabel("Step")
+        self.ax.set_ylabel("Term")
+        self.ax.set_title(f"Aliquot Sequences, n = {first_n + rows.start}..{first_n + rows.stop - 1}")
+        self.ax.grid(True, which="major", alpha=0.3)
+
+        self.lines = [self.ax.plot([], [], "-", color=color, lw=1.5, animated=True)[0] for _ in range(trail)]
+        self.label = self.ax.text(0.98, 0.95, "", transform=self.ax.transAxes, ha="right", va="top", animated=True)
+
+    def trajectory(self, row: int) -> "tuple[npt.NDArray[np.int64], npt.NDArray[np.float64]]":
+        """
+        Steps and terms of n, s(n), ... for row, without the final 0 which has no place on a log scale, and up to
+        the first term beyond the float range.
+        """
+        terms = float_terms([self.first_n + row, *self.store.sequence(row)])
+        beyond = np.flatnonzero(~np.isfinite(terms))
+        if len(beyond):
+            terms = terms[: beyond[0]]
+        terms = terms[terms > 0]
+        return np.arange(len(terms)), terms
+
+    def update(self, frame: int) -> "list":
+        """Point the reused artists at the trajectory of frame, and return the ones to draw."""
+        row = self.rows[frame]
+        steps, terms = self.trajectory(row)
+        self.lines[frame % len(self.lines)].set_data(steps, terms)
+        for age in range(len(self.lines)):
+            line = self.lines[(frame - age) % len(self.lines)]
+            line.set_alpha((1 - age / len(self.lines)) if age <= frame else 0)
+            line.set_linewidth(2 if age == 0 else 1)
+        al_seq = self.store.aliquot_sequence[row]
+        # every term but a final 0 is drawn, unless one was beyond the float range
+        truncated = len(terms) < 1 + len(al_seq) - (len(al_seq) > 0 and al_seq[-1] == 0)
+        self.label.set_text(f"n = {self.first_n + row}, {len(al_seq)} terms{', truncated' if truncated else ''}")
+        return [*self.lines, self.label]
+
+    def save(self, writer: FrameWriter, path: Path) -> None:
+        """Render every frame by blitting onto the static background, streaming each to writer."""
+        canvas = self.fig.canvas
+        canvas.draw()
+        background = canvas.copy_from_bbox(self.fig.bbox)
+        with writer.saving(self.fig, path, self.fig.dpi):
+            for frame in range(len(self.rows)):
+                canvas.restore_region(background)
+                for artist in self.update(frame):
+                    self.ax.draw_artist(artist)
+                writer.grab_frame()
+
+    def show(self, fps: int = 30) -> FuncAnimation:
+        """Play the animation in a window, generating frames as they are shown."""
+        animation = FuncAnimation(
+            self.fig, self.update, frames=len(self.rows), interval=1000 / fps, blit=True, cache_frame_data=False
+        )
+        plt.show()
+        return animation
+
+
+def frame_writer(path: Path, fps: int = 30, colors: "Iterable[str]" = ("black",)) -> FrameWriter:
+    """StreamingGifWriter for a .gif path, otherwise a PngFrameWriter into the directory path."""
+    if Path(path).suffix.lower() == ".gif":
+        return StreamingGifWriter(fps=fps, colors=colors)
+    return PngFrameWriter(fps=fps)
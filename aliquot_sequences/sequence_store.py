@@ -0,0 +1,712 @@
+"""
+Binary on-disk store for aliquot sweep results.
+
+Every column is a flat binary file of one fixed width dtype, so the whole store can be memory mapped instead
+of parsed. Columns with one value per n (aliquot sum and the two lengths) are a plain array each. The variable
+length columns (proper divisor lists and aliquot sequences) use a CSR layout: a values file with every row
+concatenated, and an offsets file where row i spans values[offsets[i]:offsets[i + 1]].
+
+Row i of every column holds the results for n = first_n + i.
+
+Aliquot sequence terms outgrow 64 bits within a few dozen steps for n as small as 276. Such a term is stored as
+BIG_TERM in the fixed width values, and exactly in a side table of big terms: the position of every one of them in
+the values, and their decimal digits in the same CSR layout. SequenceStore.sequence puts them back in.
+"""
+
+import json
+import os
+import queue
+import shutil
+import sys
+import threading
+from array import array
+from pathlib import Path
+from typing import Iterable, Iterator, NamedTuple
+
+import numpy as np
+import numpy.typing as npt
+
+
+STORE_FORMAT: int = 2
+READABLE_FORMATS: "tuple[int, ...]" = (1, 2)  # format 1 had no big terms
+META_FILENAME: str = "store.json"
+CHECKPOINT_FILENAME: str = "checkpoint.json"
+VALUE_DTYPE: np.dtype = np.dtype("<u8")
+OFFSET_DTYPE: np.dtype = np.dtype("<i8")
+LENGTH_DTYPE: np.dtype = np.dtype("<u4")
+DIGIT_DTYPE: np.dtype = np.dtype("u1")
+BIG_TERM: int = 2**64 - 1  # stands in for aliquot sequence terms >= 2**64 - 1, see BigTerms
+
+SCALAR_COLUMNS: "dict[str, np.dtype]" = {
+    "proper_divisors_length": LENGTH_DTYPE,
+    "aliquot_sums": VALUE_DTYPE,
+    "aliquot_sequence_length": LENGTH_DTYPE,
+}
+LIST_COLUMNS: "tuple[str, ...]" = ("proper_divisor_lists", "aliquot_sequence")
+BIG_TERM_FILES: "dict[str, np.dtype]" = {
+    "aliquot_sequence.big_positions": OFFSET_DTYPE,
+    "aliquot_sequence.big_offsets": OFFSET_DTYPE,
+    "aliquot_sequence.big_digits": DIGIT_DTYPE,
+}
+
+TEXT_FILES: "dict[str, str]" = {
+    "proper_divisor_lists": "proper_divisor_lists.txt",
+    "aliquot_sums": "aliquot_sums.txt",
+    "aliquot_sequence": "aliquot_sequence.txt",
+}
+
+
+class SequenceTable:
+    """
+    Rows of variable length, as one flat buffer of values and the offsets of every row into it.
+
+    Row i is values[offsets[i]:offsets[i + 1]]. Indexing gives numpy views into the buffer, and the lengths and
+    aggregates are computed for every row at once, so nothing is ever expanded into Python lists. The buffers can
+    be memory maps of a store, or plain arrays.
+
+    In a store's aliquot sequences, terms too large for uint64 are BIG_TERM, so maxima saturate there rather
+    than overflow. SequenceStore.sequence has the exact terms.
+
+    Args:
+        offsets (npt.NDArray[np.int64]): start of every row and the end of the last one, non decreasing
+        values (npt.NDArray[np.uint64]): every row concatenated
+    """
+
+    def __init__(self, offsets: npt.NDArray[np.int64], values: npt.NDArray[np.uint64]):
+        self.offsets = offsets
+        self.values = values
+
+    @classmethod
+    def from_rows(cls, rows: "Iterable[list[int]]", dtype: np.dtype = VALUE_DTYPE) -> "SequenceTable":
+        """
+        Pack rows of Python ints into a table.
+
+        Examples:
+        >>> table = SequenceTable.from_rows([[16, 15, 9, 4, 3, 1, 0], [], [284, 220]])
+        >>> len(table), table[2].tolist(), table.lengths().tolist()
+        (3, [284, 220], [7, 0, 2])
+        """
+        rows = list(rows)
+        offsets = np.zeros(len(rows) + 1, dtype=OFFSET_DTYPE)
+        np.cumsum([len(row) for row in rows], out=offsets[1:])
+        values = np.fromiter((value for row in rows for value in row), dtype=dtype, count=offsets[-1])
+        return cls(offsets, values)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i: "int | slice") -> "npt.NDArray[np.uint64] | SequenceTable":
+        """
+        Row i as a view, or a contiguous range of rows as a table sharing the same buffers.
+
+        Raises:
+            IndexError: if row i doesn't exist.
+            ValueError: if the slice has a step, its rows wouldn't be contiguous.
+        """
+        if isinstance(i, slice):
+            start, stop, step = i.indices(len(self))
+            if step != 1:
+                raise ValueError("Only contiguous rows can be sliced.")
+            return SequenceTable(self.offsets[start : max(start, stop) + 1], self.values)
+
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(f"Row {i} is outside of a table of {len(self)} rows.")
+        return self.values[self.offsets[i] : self.offsets[i + 1]]
+
+    def __iter__(self) -> "Iterator[npt.NDArray[np.uint64]]":
+        for start, stop in zip(self.offsets[:-1], self.offsets[1:]):
+            yield self.values[start:stop]
+
+    def lengths(self) -> npt.NDArray[np.int64]:
+        """Length of every row."""
+        return np.diff(self.offsets)
+
+    def reduce(self, ufunc: np.ufunc, empty: "int | float" = 0, dtype: "np.dtype | None" = None) -> np.ndarray:
+        """
+        ufunc folded over every row at once, eg np.maximum for the largest term of every row.
+
+        Args:
+            ufunc (np.ufunc): binary ufunc to fold rows with
+            empty (int | float, optional): result for empty rows. Defaults to 0.
+            dtype (np.dtype, optional): dtype to accumulate in. Defaults to the dtype of values.
+        """
+        nonempty = self.lengths() > 0
+        result = np.full(len(self), empty, dtype=dtype or self.values.dtype)
+        if nonempty.any():
+            # the rows between consecutive nonempty starts are empty, so each segment is exactly one row
+            values = self.values[: self.offsets[-1]]
+            result[nonempty] = ufunc.reduceat(values, self.offsets[:-1][nonempty], dtype=dtype)
+        return result
+
+    def totals(self) -> npt.NDArray[np.float64]:
+        """Sum of every row, in float64 since sums of terms near 2**64 overflow any integer dtype."""
+        return self.reduce(np.add, dtype=np.float64)
+
+    def maxima(self, empty: int = 0) -> npt.NDArray[np.uint64]:
+        """Largest value of every row."""
+        return self.reduce(np.maximum, empty)
+
+    def minima(self, empty: int = 0) -> npt.NDArray[np.uint64]:
+        """Smallest value of every row."""
+        return self.reduce(np.minimum, empty)
+
+    def last(self, empty: int = 0) -> npt.NDArray[np.uint64]:
+        """Last value of every row, eg 0 for terminating aliquot sequences."""
+        lengths = self.lengths()
+        result = np.full(len(self), empty, dtype=self.values.dtype)
+        result[lengths > 0] = self.values[self.offsets[1:][lengths > 0] - 1]
+        return result
+
+
+class BigTerms(NamedTuple):
+    """
+    Aliquot sequence terms too large for the values of the sequence table, by position in those values.
+
+    Term i is at values[positions[i]] and its decimal digits are digits[offsets[i]:offsets[i + 1]]. Positions are
+    increasing, since rows are written in order.
+    """
+
+    positions: npt.NDArray[np.int64]
+    offsets: npt.NDArray[np.int64]
+    digits: npt.NDArray[np.uint8]
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def term(self, i: int) -> int:
+        return int(self.digits[self.offsets[i] : self.offsets[i + 1]].tobytes())
+
+    def between(self, start: int, stop: int) -> "Iterator[tuple[int, int]]":
+        """Position and value of every big term at start <= position < stop."""
+        lo, hi = np.searchsorted(self.positions, [start, stop])
+        for i in range(lo, hi):
+            yield int(self.positions[i]), self.term(i)
+
+
+def empty_big_terms() -> BigTerms:
+    return BigTerms(np.zeros(0, OFFSET_DTYPE), np.zeros(1, OFFSET_DTYPE), np.zeros(0, DIGIT_DTYPE))
+
+
+class SequenceStore(NamedTuple):
+    """Memory mapped columns of a sequence store."""
+
+    first_n: int
+    proper_divisor_lists: SequenceTable
+    proper_divisors_length: npt.NDArray[np.uint32]
+    aliquot_sums: npt.NDArray[np.uint64]
+    aliquot_sequence: SequenceTable
+    aliquot_sequence_length: npt.NDArray[np.uint32]
+    big_terms: BigTerms
+
+    def __len__(self) -> int:
+        return len(self.aliquot_sums)
+
+    def sequence(self, row: int) -> "list[int]":
+        """The exact aliquot sequence of row, with the terms too large for the table put back in."""
+        terms = self.aliquot_sequence[row].tolist()
+        start = int(self.aliquot_sequence.offsets[row])
+        for position, term in self.big_terms.between(start, start + len(terms)):
+            terms[position - start] = term
+        return terms
+
+
+def scalar_path(directory: Path, column: str) -> Path:
+    return directory.joinpath(f"{column}.bin")
+
+
+def offsets_path(directory: Path, column: str) -> Path:
+    return directory.joinpath(f"{column}.offsets.bin")
+
+
+def values_path(directory: Path, column: str) -> Path:
+    return directory.joinpath(f"{column}.values.bin")
+
+
+def batch_array(dtype: np.dtype) -> array:
+    """An empty array.array of the same item type as dtype, for collecting a batch of its column."""
+    return array({VALUE_DTYPE: "Q", OFFSET_DTYPE: "q", LENGTH_DTYPE: "I", DIGIT_DTYPE: "B"}[dtype])
+
+
+def encode_row(values: "list[int]", dtype: np.dtype) -> bytes:
+    """
+    Pack a row of Python ints into raw bytes of the given dtype.
+
+    Raises:
+        OverflowError: if a value does not fit in dtype, eg an aliquot sequence term >= 2**64.
+    """
+    return np.array(values, dtype=dtype).tobytes()
+
+
+def split_big_terms(al_seq: "list[int]") -> "tuple[list[int], list[tuple[int, int]]]":
+    """
+    Replace the terms of al_seq that don't fit in VALUE_DTYPE with BIG_TERM.
+
+    Returns:
+        tuple[list[int], list[tuple[int, int]]]: the row to store, and the index and value of every big term
+
+    Examples:
+    >>> split_big_terms([396, 2**64 + 5, 7])
+    ([396, 18446744073709551615, 7], [(1, 18446744073709551621)])
+    """
+    big = [(index, term) for index, term in enumerate(al_seq) if term >= BIG_TERM]
+    if not big:
+        return al_seq, big
+    row = list(al_seq)
+    for index, _ in big:
+        row[index] = BIG_TERM
+    return row, big
+
+
+class SequenceStoreWriter:
+    """
+    Append sweep results to a sequence store, one n per row.
+
+    Creating a writer truncates any existing store in the directory, unless resume_rows is given. Files stay open
+    until close(), and rows are collected into an array.array per file, so a row costs a few appends rather than
+    a numpy round trip per value, and every batch of batch_rows is written as one large write per file.
+    With background=True the batches go through a bounded queue to a writer thread, so the sweep keeps computing
+    while the previous batch is written, and only blocks when queue_batches batches are already waiting.
+
+    With checkpoint=True every written batch is fsynced and followed by an atomic rewrite of checkpoint.json,
+    holding the number of rows that are safely on disk and a copy of checkpoint_state. A store can then be reopened
+    with resume_rows set to the checkpointed rows, which drops anything written after the checkpoint.
+
+    close() writes the last partial batch, then flushes and fsyncs every file. Use it as a context manager so that
+    also happens when the sweep is interrupted with Ctrl-C.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        first_n: int = 1,
+        batch_rows: int = 4096,
+        background: bool = True,
+        queue_batches: int = 8,
+        checkpoint: bool = False,
+        resume_rows: "int | None" = None,
+    ):
+        self.directory = directory
+        self.batch_rows = batch_rows
+        self.checkpoint = checkpoint
+        self.checkpoint_state = {}
+        self._batch_rows = 0
+        self._offsets = {}
+
+        if resume_rows is None:
+            write_meta(directory, first_n)
+            self.first_n = first_n
+            self.rows = 0
+            self._files = {column: open(scalar_path(directory, column), "wb") for column in SCALAR_COLUMNS}
+            for column in LIST_COLUMNS:
+                self._files[f"{column}.offsets"] = open(offsets_path(directory, column), "wb")
+                self._files[f"{column}.values"] = open(values_path(directory, column), "wb")
+            for name in BIG_TERM_FILES:
+                self._files[name] = open(scalar_path(directory, name), "wb")
+            self._batch = self._new_batch()
+            for column in LIST_COLUMNS:
+                self._offsets[column] = 0
+                self._batch[f"{column}.offsets"].append(0)
+            self._big_digits = 0
+            self._batch["aliquot_sequence.big_offsets"].append(0)
+        else:
+            with open(directory.joinpath(META_FILENAME), "r", encoding="utf-8") as f:
+                self.first_n = json.load(f)["first_n"]
+            self.rows = resume_rows
+            self._files = {
+                column: open_truncated(scalar_path(directory, column), resume_rows * dtype.itemsize)
+                for column, dtype in SCALAR_COLUMNS.items()
+            }
+            for column in LIST_COLUMNS:
+                offsets_file = open_truncated(offsets_path(directory, column), (resume_rows + 1) * OFFSET_DTYPE.itemsize)
+                offsets_file.seek(resume_rows * OFFSET_DTYPE.itemsize)
+                self._offsets[column] = int(np.frombuffer(offsets_file.read(OFFSET_DTYPE.itemsize), OFFSET_DTYPE)[0])
+                self._files[f"{column}.offsets"] = offsets_file
+                self._files[f"{column}.values"] = open_truncated(
+                    values_path(directory, column), self._offsets[column] * VALUE_DTYPE.itemsize
+                )
+            self._open_big_terms_truncated(directory, self._offsets["aliquot_sequence"])
+            self._batch = self._new_batch()
+
+        self._error = None
+        self._thread = None
+        if background:
+            self._queue = queue.Queue(maxsize=queue_batches)
+            self._thread = threading.Thread(target=self._write_queued_batches, name="SequenceStoreWriter", daemon=True)
+            self._thread.start()
+
+    @staticmethod
+    def _new_batch() -> "dict[str, array]":
+        batch = {column: batch_array(dtype) for column, dtype in SCALAR_COLUMNS.items()}
+        for column in LIST_COLUMNS:
+            batch[f"{column}.offsets"] = batch_array(OFFSET_DTYPE)
+            batch[f"{column}.values"] = batch_array(VALUE_DTYPE)
+        batch.update((name, batch_array(dtype)) for name, dtype in BIG_TERM_FILES.items())
+        return batch
+
+    def _open_big_terms_truncated(self, directory: Path, values: int) -> None:
+        """Open the big term files for appending after the big terms of the first values sequence values."""
+        paths = {name: scalar_path(directory, name) for name in BIG_TERM_FILES}
+        if not paths["aliquot_sequence.big_offsets"].exists():
+            # a format 1 store, which had no big terms
+            paths["aliquot_sequence.big_positions"].touch()
+            paths["aliquot_sequence.big_offsets"].write_bytes(encode_row([0], OFFSET_DTYPE))
+            paths["aliquot_sequence.big_digits"].touch()
+        positions = memory_map(paths["aliquot_sequence.big_positions"], OFFSET_DTYPE)
+        kept = int(np.searchsorted(positions, values))
+        offsets = memory_map(paths["aliquot_sequence.big_offsets"], OFFSET_DTYPE)
+        self._big_digits = int(offsets[kept])
+        del positions, offsets
+        self._files["aliquot_sequence.big_positions"] = open_truncated(
+            paths["aliquot_sequence.big_positions"], kept * OFFSET_DTYPE.itemsize
+        )
+        self._files["aliquot_sequence.big_offsets"] = open_truncated(
+            paths["aliquot_sequence.big_offsets"], (kept + 1) * OFFSET_DTYPE.itemsize
+        )
+        self._files["aliquot_sequence.big_digits"] = open_truncated(
+            paths["aliquot_sequence.big_digits"], self._big_digits
+        )
+
+    def append(
+        self, proper_divisors: "list[int]", al_sum: int, al_seq: "list[int]", al_seq_length: "int | None" = None
+    ) -> None:
+        """
+        Add the results for the next n to the current batch.
+
+        Args:
+            proper_divisors (list[int]): proper divisors of n
+            al_sum (int): aliquot sum of n
+            al_seq (list[int]): aliquot sequence of n, terms too large for the values go to the big terms
+            al_seq_length (int, optional): number of distinct terms in al_seq, if the caller already knows it.
+                Defaults to len(set(al_seq)).
+
+        Raises:
+            OverflowError: if a value other than a sequence term does not fit in the store dtypes.
+        """
+        if al_seq_length is None:
+            al_seq_length = len(set(al_seq))
+        al_seq, big_terms = split_big_terms(al_seq)
+        batch = self._batch
+        sizes = [len(values) for values in batch.values()]
+        try:
+            batch["proper_divisors_length"].append(len(proper_divisors))
+            batch["aliquot_sums"].append(al_sum)
+            batch["aliquot_sequence_length"].append(al_seq_length)
+            batch["proper_divisor_lists.values"].extend(proper_divisors)
+            batch["aliquot_sequence.values"].extend(al_seq)
+        except OverflowError:
+            # roll the batch back to the previous row, so it is never left half written
+            for values, size in zip(batch.values(), sizes):
+                del values[size:]
+            raise
+
+        for index, term in big_terms:
+            digits = str(term).encode("ascii")
+            self._big_digits += len(digits)
+            batch["aliquot_sequence.big_positions"].append(self._offsets["aliquot_sequence"] + index)
+            batch["aliquot_sequence.big_offsets"].append(self._big_digits)
+            batch["aliquot_sequence.big_digits"].frombytes(digits)
+        for column, values in (("proper_divisor_lists", proper_divisors), ("aliquot_sequence", al_seq)):
+            self._offsets[column] += len(values)
+            batch[f"{column}.offsets"].append(self._offsets[column])
+
+        self.rows += 1
+        self._batch_rows += 1
+        if self._batch_rows >= self.batch_rows:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Hand the current batch to the writer thread, or write it directly when not running in the background.
+        When checkpointing, the checkpoint for the rows so far is written right after the batch.
+        """
+        data = self._batch
+        self._batch = self._new_batch()
+        if sys.byteorder != "little":
+            for values in data.values():
+                values.byteswap()
+        self._batch_rows = 0
+        checkpoint = {**self.checkpoint_state, "rows": self.rows} if self.checkpoint else None
+
+        if self._thread is None:
+            self._write_batch(data, checkpoint)
+            return
+        if self._error is not None:
+            raise self._error
+        self._queue.put((data, checkpoint))
+
+    def _write_batch(self, data: "dict[str, array]", checkpoint: "dict | None") -> None:
+        for name, chunk in data.items():
+            if chunk:
+                self._files[name].write(chunk)
+        if checkpoint is not None:
+            # the rows have to be on disk before the checkpoint can claim them
+            self._sync()
+            save_checkpoint(self.directory.joinpath(CHECKPOINT_FILENAME), checkpoint)
+
+    def _write_queued_batches(self) -> None:
+        """Writer thread loop. After a failed write the queue is still drained so the sweep never blocks on it."""
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            if self._error is None:
+                try:
+                    self._write_batch(*item)
+                except BaseException as e:  # re-raised in the sweep thread on the next flush or close
+                    self._error = e
+
+    def _sync(self) -> None:
+        for f in self._files.values():
+            f.flush()
+            os.fsync(f.fileno())
+
+    def close(self) -> None:
+        """Write the remaining rows, wait for the writer thread, then flush, fsync and close every file."""
+        try:
+            self.flush()
+        finally:
+            if self._thread is not None:
+                self._queue.put(None)
+                self._thread.join()
+            self._sync()
+            for f in self._files.values():
+                f.close()
+        if self._error is not None:
+            raise self._error
+
+    def __enter__(self) -> "SequenceStoreWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def write_meta(directory: Path, first_n: int) -> None:
+    """Start a new store in directory, dropping any checkpoint an earlier store left there."""
+    directory.mkdir(parents=True, exist_ok=True)
+    directory.joinpath(CHECKPOINT_FILENAME).unlink(missing_ok=True)
+    with open(directory.joinpath(META_FILENAME), "w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "format": STORE_FORMAT,
+                "first_n": first_n,
+                "value_dtype": VALUE_DTYPE.str,
+                "offset_dtype": OFFSET_DTYPE.str,
+                "length_dtype": LENGTH_DTYPE.str,
+            },
+            f,
+            indent=4,
+        )
+
+
+def open_truncated(path: Path, size: int):
+    """
+    Open an existing column file for appending after its first size bytes, dropping anything past them.
+
+    Raises:
+        ValueError: if the file is shorter than size, ie the store lost data the checkpoint says was written.
+    """
+    f = open(path, "r+b")
+    if os.fstat(f.fileno()).st_size < size:
+        f.close()
+        raise ValueError(f"{path} is shorter than its checkpoint, can't resume.")
+    f.truncate(size)
+    f.seek(size)
+    return f
+
+
+def save_checkpoint(path: Path, checkpoint: dict) -> None:
+    """Atomically replace a JSON checkpoint file, so a crash leaves either the old or the new checkpoint."""
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(checkpoint, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def load_checkpoint(path: Path) -> "dict | None":
+    """The last checkpoint saved to path, or None when there is none."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def memory_map(path: Path, dtype: np.dtype) -> np.ndarray:
+    """Read-only memory map of a flat binary file. Empty files give an empty array, mmap can't map them."""
+    if path.stat().st_size == 0:
+        return np.zeros(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="r")
+
+
+def open_sequence_store(directory: Path) -> SequenceStore:
+    """
+    Memory map every column of a sequence store. Nothing is read until the arrays are indexed.
+
+    Raises:
+        FileNotFoundError: if there is no store in directory.
+        ValueError: if the store format is unknown or the columns disagree on the number of rows or values.
+    """
+    with open(directory.joinpath(META_FILENAME), "r", encoding="utf-8") as f:
+        meta = json.load(f)
+    if meta["format"] not in READABLE_FORMATS:
+        raise ValueError(f"Unknown sequence store format: {meta['format']}.")
+
+    columns = {column: memory_map(scalar_path(directory, column), dtype) for column, dtype in SCALAR_COLUMNS.items()}
+    for column in LIST_COLUMNS:
+        columns[column] = SequenceTable(
+            memory_map(offsets_path(directory, column), OFFSET_DTYPE),
+            memory_map(values_path(directory, column), VALUE_DTYPE),
+        )
+
+    if scalar_path(directory, "aliquot_sequence.big_offsets").exists():
+        columns["big_terms"] = BigTerms(
+            *(memory_map(scalar_path(directory, name), dtype) for name, dtype in BIG_TERM_FILES.items())
+        )
+    else:
+        columns["big_terms"] = empty_big_terms()
+
+    rows = len(columns["aliquot_sums"])
+    for column in SCALAR_COLUMNS:
+        if len(columns[column]) != rows:
+            raise ValueError(f"Column {column} has {len(columns[column])} rows, expected {rows}.")
+    for column in LIST_COLUMNS:
+        table = columns[column]
+        if len(table) != rows or table.offsets[-1] != len(table.values):
+            raise ValueError(f"Column {column} offsets don't match {rows} rows of {len(table.values)} values.")
+    big_terms = columns["big_terms"]
+    if len(big_terms.offsets) != len(big_terms) + 1 or big_terms.offsets[-1] != len(big_terms.digits):
+        raise ValueError(f"Big term offsets don't match {len(big_terms)} terms of {len(big_terms.digits)} digits.")
+
+    return SequenceStore(first_n=meta["first_n"], **columns)
+
+
+def concatenate_sequence_stores(directories: "list[Path]", destination: Path, chunk_rows: int = 1 << 20) -> int:
+    """
+    Write the rows of several stores one after the other into a new store, eg the shards of a sweep.
+
+    Scalar columns and list values are copied file to file, and offsets are shifted by the number of values
+    before them, chunk_rows at a time, so memory use doesn't depend on the size of the stores.
+
+    Raises:
+        ValueError: if a store doesn't start at the n right after the last row of the store before it.
+
+    Returns:
+        int: number of rows in the new store
+    """
+    stores = [open_sequence_store(directory) for directory in directories]
+    for directory, before, after in zip(directories[1:], stores, stores[1:]):
+        if after.first_n != before.first_n + len(before):
+            raise ValueError(f"{directory} starts at n={after.first_n}, expected n={before.first_n + len(before)}.")
+
+    write_meta(destination, stores[0].first_n if stores else 1)
+    for column in SCALAR_COLUMNS:
+        with open(scalar_path(destination, column), "wb") as f:
+            for directory in directories:
+                with open(scalar_path(directory, column), "rb") as shard:
+                    shutil.copyfileobj(shard, f)
+            f.flush()
+            os.fsync(f.fileno())
+
+    for column in LIST_COLUMNS:
+        with open(offsets_path(destination, column), "wb") as f:
+            f.write(encode_row([0], OFFSET_DTYPE))
+            base = 0
+            for store in stores:
+                offsets = getattr(store, column).offsets
+                for start in range(1, len(offsets), chunk_rows):
+                    f.write((offsets[start : start + chunk_rows] + base).astype(OFFSET_DTYPE).tobytes())
+                base += int(offsets[-1])
+            f.flush()
+            os.fsync(f.fileno())
+        with open(values_path(destination, column), "wb") as f:
+            for directory in directories:
+                with open(values_path(directory, column), "rb") as shard:
+                    shutil.copyfileobj(shard, f)
+            f.flush()
+            os.fsync(f.fileno())
+
+    # big term positions index the concatenated values, and their offsets the concatenated digits. There are few
+    # enough big terms to write them from memory.
+    with open(scalar_path(destination, "aliquot_sequence.big_positions"), "wb") as positions_file, open(
+        scalar_path(destination, "aliquot_sequence.big_offsets"), "wb"
+    ) as offsets_file, open(scalar_path(destination, "aliquot_sequence.big_digits"), "wb") as digits_file:
+        offsets_file.write(encode_row([0], OFFSET_DTYPE))
+        values_base = digits_base = 0
+        for store in stores:
+            big_terms = store.big_terms
+            positions_file.write((big_terms.positions + values_base).astype(OFFSET_DTYPE).tobytes())
+            offsets_file.write((big_terms.offsets[1:] + digits_base).astype(OFFSET_DTYPE).tobytes())
+            digits_file.write(big_terms.digits.tobytes())
+            values_base += len(store.aliquot_sequence.values)
+            digits_base += len(big_terms.digits)
+        for f in (positions_file, offsets_file, digits_file):
+            f.flush()
+            os.fsync(f.fileno())
+
+    return sum(len(store) for store in stores)
+
+
+def parse_text_line(line: str) -> "tuple[int, list[int]]":
+    """Parse a legacy `n-[a, b, c]` or `n-a` line into n and its values."""
+    n, values = line.strip().split("-", 1)
+    return int(n), [int(val) for val in values.strip("[]").split(",") if val.strip() != ""]
+
+
+def read_text_sequence_files(directory: Path) -> "Iterator[tuple[int, list[int], int, list[int]]]":
+    """
+    Stream rows from the legacy text sequence files, one n at a time.
+
+    Only the divisor lists, sums and sequences are read, the two length files are derived from them.
+
+    Yields:
+        tuple[int, list[int], int, list[int]]: n, proper divisors, aliquot sum, aliquot sequence
+    """
+    files = {column: open(directory.joinpath(name), "r", encoding="utf-8") for column, name in TEXT_FILES.items()}
+    try:
+        for divisors_line, sum_line, sequence_line in zip(*files.values()):
+            n, proper_divisors = parse_text_line(divisors_line)
+            sum_n, (al_sum,) = parse_text_line(sum_line)
+            sequence_n, al_seq = parse_text_line(sequence_line)
+            if not n == sum_n == sequence_n:
+                raise ValueError(f"Sequence files are out of step at n={n}.")
+            yield n, proper_divisors, al_sum, al_seq
+    finally:
+        for f in files.values():
+            f.close()
+
+
+def convert_text_sequence_files(text_directory: Path, store_directory: "Path | None" = None) -> int:
+    """
+    One-shot conversion of the legacy `n-[...]` text sequence files into a binary sequence store.
+
+    Args:
+        text_directory (Path): directory with the legacy .txt files
+        store_directory (Path, optional): directory to write the store to. Defaults to text_directory.
+
+    Raises:
+        ValueError: if the text files skip or repeat an n.
+
+    Returns:
+        int: number of rows converted
+    """
+    rows = read_text_sequence_files(text_directory)
+    first = next(rows, None)
+    if first is None:
+        first_n = 1
+    else:
+        first_n = first[0]
+
+    with SequenceStoreWriter(store_directory or text_directory, first_n=first_n) as writer:
+        if first is not None:
+            writer.append(*first[1:])
+        for n, proper_divisors, al_sum, al_seq in rows:
+            if n != first_n + writer.rows:
+                raise ValueError(f"Expected n={first_n + writer.rows} in sequence files, found n={n}.")
+            writer.append(proper_divisors, al_sum, al_seq)
+
+    return writer.rows
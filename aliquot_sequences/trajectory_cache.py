@@ -0,0 +1,58 @@
+"""
+Shared memo of aliquot sequence successors.
+
+Aliquot sequences of different starting values merge all the time, most of them flow into 1 -> 0 or into the same
+few amicable cycles, and often pass through the same large terms on the way. The cache keeps s(v) for the values
+it has seen, so a later sequence that reaches one of them follows the cached successors instead of factoring the
+same terms again.
+
+Values up to table_limit aren't cached at all: a sieved sum table of that bound already answers them in O(1), and
+a Python dict entry per value would take dozens of times its memory. Values above it are held in an LRU of at most
+max_entries, since open sequences can visit an unbounded number of huge terms.
+"""
+
+from collections import OrderedDict
+
+
+class TrajectoryCache:
+    """
+    Successors of aliquot sequence values above a sum table, shared across sequences.
+
+    Args:
+        table_limit (int, optional): bound of the sum table used alongside the cache, values up to it are left to
+            the table. Defaults to 0, caching every value.
+        max_entries (int, optional): most values kept at once, least recently used are evicted first.
+            Defaults to 10**6.
+    """
+
+    def __init__(self, table_limit: int = 0, max_entries: int = 10**6):
+        self.table_limit = table_limit
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._successors: "OrderedDict[int, int]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._successors)
+
+    def __contains__(self, n: int) -> bool:
+        return n in self._successors
+
+    def successor(self, n: int) -> "int | None":
+        """s(n) if it is cached, otherwise None."""
+        successor = self._successors.get(n)
+        if successor is None:
+            self.misses += 1
+            return None
+        self._successors.move_to_end(n)
+        self.hits += 1
+        return successor
+
+    def add_successor(self, n: int, successor: int) -> None:
+        if n <= self.table_limit:
+            return
+        self._successors[n] = successor
+        if len(self._successors) > self.max_entries:
+            self._successors.popitem(last=False)
+            self.evictions += 1
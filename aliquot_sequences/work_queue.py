@@ -0,0 +1,377 @@
+"""
+File based work queue for sharding an aliquot sweep across processes and hosts.
+
+The queue is a directory on storage every worker can reach, eg an NFS mount, and needs no other service:
+
+    queue.json                      the sweep: n, shard size, iteration cutoff, lease length
+    leases/<shard>.lease            held by the worker computing the shard, its mtime is the heartbeat
+    shards/<shard>/                 sequence store of every finished shard
+    shards/<shard>.<worker>.tmp/    shard being written
+
+A worker claims a shard by creating its lease with O_CREAT | O_EXCL, so exactly one worker gets it. While it
+computes, a heartbeat thread touches the lease every lease_seconds / 3. A lease that hasn't been touched for
+lease_seconds belongs to a worker that died, and is taken over by renaming it aside, which again only one worker
+can do. Shards are written to a directory of their own and published by renaming it into place, so a shard is
+either complete or absent, and a worker that lost its lease to a takeover can at worst publish the same rows.
+
+Leases rely on the hosts' clocks agreeing to well within lease_seconds.
+Shard names are the first and last n of the shard, so sorting them puts the shards in n order for merge_shards.
+"""
+
+import errno
+import json
+import os
+import shutil
+import socket
+import threading
+import time
+from multiprocessing import Process
+from pathlib import Path
+
+from aliquot_sequences import aliquot_sequence_sequences
+from sequence_store import META_FILENAME, concatenate_sequence_stores
+
+
+QUEUE_FORMAT: int = 1
+QUEUE_FILENAME: str = "queue.json"
+LEASES_DIR: str = "leases"
+SHARDS_DIR: str = "shards"
+
+
+def create_work_queue(
+    queue_dir: Path,
+    n: int,
+    shard_size: int = 10**5,
+    seq_iteration_cutoff: int = 100,
+    lease_seconds: float = 60.0,
+) -> dict:
+    """
+    Set up a work queue for the sweep of 1..n, or check that an existing one is for the same sweep.
+
+    Args:
+        queue_dir (Path): shared queue directory
+        n (int): largest initializing value
+        shard_size (int, optional): number of n per shard. Defaults to 10**5.
+        seq_iteration_cutoff (int, optional): An iteration bound for sequences. Defaults to 100.
+        lease_seconds (float, optional): seconds without a heartbeat after which a lease is taken over.
+            Defaults to 60.0.
+
+    Raises:
+        ValueError: if queue_dir already holds a queue for a different sweep.
+
+    Returns:
+        dict: the queue settings
+    """
+    config = {
+        "format": QUEUE_FORMAT,
+        "n": n,
+        "shard_size": shard_size,
+        "seq_iteration_cutoff": seq_iteration_cutoff,
+        "lease_seconds": lease_seconds,
+    }
+    queue_dir.joinpath(LEASES_DIR).mkdir(parents=True, exist_ok=True)
+    queue_dir.joinpath(SHARDS_DIR).mkdir(parents=True, exist_ok=True)
+
+    existing = load_work_queue(queue_dir) if queue_dir.joinpath(QUEUE_FILENAME).exists() else None
+    if existing is None:
+        tmp_path = queue_dir.joinpath(f"{QUEUE_FILENAME}.{worker_name()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(config, f, indent=4)
+        os.replace(tmp_path, queue_dir.joinpath(QUEUE_FILENAME))
+    elif existing != config:
+        raise ValueError(f"{queue_dir} already holds a different sweep: {existing}.")
+    return config
+
+
+def load_work_queue(queue_dir: Path) -> dict:
+    """
+    Settings of the work queue in queue_dir.
+
+    Raises:
+        FileNotFoundError: if there is no queue in queue_dir.
+        ValueError: if the queue format is unknown.
+    """
+    with open(queue_dir.joinpath(QUEUE_FILENAME), "r", encoding="utf-8") as f:
+        config = json.load(f)
+    if config["format"] != QUEUE_FORMAT:
+        raise ValueError(f"Unknown work queue format: {config['format']}.")
+    return config
+
+
+def shard_ranges(config: dict) -> "list[tuple[int, int]]":
+    """First and last n of every shard, in order."""
+    return [
+        (first, min(first + config["shard_size"] - 1, config["n"]))
+        for first in range(1, config["n"] + 1, config["shard_size"])
+    ]
+
+
+def shard_name(first: int, last: int) -> str:
+    return f"{first:015d}-{last:015d}"
+
+
+def worker_name() -> str:
+    """Name of this process, unique across the hosts sharing a queue."""
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+def is_complete(queue_dir: Path, shard: str) -> bool:
+    return queue_dir.joinpath(SHARDS_DIR, shard, META_FILENAME).exists()
+
+
+def lease_expired(lease_path: Path, lease_seconds: float) -> bool:
+    """Whether the lease hasn't had a heartbeat for lease_seconds. A lease that is gone counts as expired."""
+    try:
+        return time.time() - lease_path.stat().st_mtime > lease_seconds
+    except FileNotFoundError:
+        return True
+
+
+def try_lease(lease_path: Path, worker: str, lease_seconds: float) -> bool:
+    """
+    Atomically take the lease at lease_path for worker, if it is free or expired.
+
+    Returns:
+        bool: whether worker now holds the lease
+    """
+    for _ in range(2):
+        try:
+            fd = os.open(lease_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            if not lease_expired(lease_path, lease_seconds):
+                return False
+            # rename the expired lease aside, of all the workers trying only one rename finds it
+            stale_path = lease_path.with_name(f"{lease_path.name}.{worker}.stale")
+            try:
+                os.rename(lease_path, stale_path)
+            except FileNotFoundError:
+                return False
+            if not lease_expired(stale_path, lease_seconds):
+                # its holder heartbeated in between, give it back unless someone leased it already
+                try:
+                    os.link(stale_path, lease_path)
+                except FileExistsError:
+                    pass
+                os.unlink(stale_path)
+                return False
+            os.unlink(stale_path)
+            continue
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(worker)
+        return True
+    return False
+
+
+def lease_holder(lease_path: Path) -> "str | None":
+    try:
+        return lease_path.read_text(encoding="utf-8")
+    except FileNotFoundError:
+        return None
+
+
+class Heartbeat:
+    """
+    Touches a lease every interval seconds from a background thread, for as long as worker still holds it.
+
+    lost is set once another worker holds the lease, the rows computed after that are only published if the
+    shard isn't published by its new holder first. A missing or unreadable lease is not lost, only retried.
+    """
+
+    def __init__(self, lease_path: Path, worker: str, interval: float):
+        self.lease_path = lease_path
+        self.worker = worker
+        self.interval = interval
+        self.lost = threading.Event()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._beat, daemon=True)
+
+    def _beat(self) -> None:
+        while not self._stop.wait(self.interval):
+            # a lease that is missing, empty or unreadable for a moment, eg while try_lease has it renamed aside or
+            # on a transient error of a network mount, is retried on the next beat, only another holder means lost
+            try:
+                holder = lease_holder(self.lease_path)
+                if holder == self.worker:
+                    os.utime(self.lease_path)
+            except OSError:
+                continue
+            if holder and holder != self.worker:
+                self.lost.set()
+                return
+
+    def __enter__(self) -> "Heartbeat":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stop.set()
+        self._thread.join()
+
+
+def claim_shard(queue_dir: Path, worker: str) -> "tuple[int, int] | None":
+    """
+    Lease the first shard that is neither finished nor leased by a live worker.
+
+    Returns:
+        tuple[int, int] | None: first and last n of the claimed shard, or None if there is none to claim
+    """
+    config = load_work_queue(queue_dir)
+    for first, last in shard_ranges(config):
+        shard = shard_name(first, last)
+        if is_complete(queue_dir, shard):
+            continue
+        lease_path = queue_dir.joinpath(LEASES_DIR, f"{shard}.lease")
+        if try_lease(lease_path, worker, config["lease_seconds"]) and not is_complete(queue_dir, shard):
+            return first, last
+    return None
+
+
+def publish_shard(queue_dir: Path, shard: str, tmp_dir: Path, worker: str) -> bool:
+    """
+    Move a finished shard into place. If another worker got there first its copy is kept and tmp_dir dropped,
+    along with any partial shard left by a worker that no longer holds a live lease on the shard.
+
+    The partial shard of the live lease holder is left alone, it is still being written to. That worker finds the
+    shard published when it finishes, and drops its own.
+
+    Returns:
+        bool: whether tmp_dir was published
+
+    Raises:
+        OSError: if tmp_dir can't be moved into place for any other reason than the shard already being there,
+            tmp_dir is then left as it is.
+    """
+    try:
+        os.rename(tmp_dir, queue_dir.joinpath(SHARDS_DIR, shard))
+        published = True
+    except OSError as e:
+        # renaming onto an existing non-empty directory fails, the shard is already there
+        if e.errno not in (errno.ENOTEMPTY, errno.EEXIST) or not is_complete(queue_dir, shard):
+            raise
+        published = False
+
+    lease_path = queue_dir.joinpath(LEASES_DIR, f"{shard}.lease")
+    live_holder = None
+    if not lease_expired(lease_path, load_work_queue(queue_dir)["lease_seconds"]):
+        live_holder = lease_holder(lease_path)
+    for partial_dir in queue_dir.joinpath(SHARDS_DIR).glob(f"{shard}.*.tmp"):
+        owner = partial_dir.name[len(shard) + 1 : -len(".tmp")]
+        if owner == worker or owner != live_holder:
+            shutil.rmtree(partial_dir, ignore_errors=True)
+    return published
+
+
+def release_lease(lease_path: Path, worker: str) -> None:
+    if lease_holder(lease_path) == worker:
+        lease_path.unlink(missing_ok=True)
+
+
+def run_worker(
+    queue_dir: Path,
+    worker: "str | None" = None,
+    max_shards: "int | None" = None,
+    poll_seconds: float = 1.0,
+) -> int:
+    """
+    Claim and compute shards until every shard of the queue is finished.
+
+    While other workers hold the remaining shards, poll every poll_seconds in case one of them dies and its lease
+    expires. The aliquot sum table of 1..n is sieved once per worker and shared by all its shards.
+
+    Args:
+        queue_dir (Path): shared queue directory, see create_work_queue
+        worker (str, optional): name of this worker. Defaults to worker_name().
+        max_shards (int, optional): stop after publishing this many shards. Defaults to None, no limit.
+        poll_seconds (float, optional): wait between claims while every open shard is leased. Defaults to 1.0.
+
+    Returns:
+        int: number of shards this worker published
+    """
+    from divisor_sieve import aliquot_sum_sieve
+
+    worker = worker or worker_name()
+    config = load_work_queue(queue_dir)
+    shards = [shard_name(first, last) for first, last in shard_ranges(config)]
+    sum_table = None
+    published = 0
+
+    while max_shards is None or published < max_shards:
+        claimed = claim_shard(queue_dir, worker)
+        if claimed is None:
+            if all(is_complete(queue_dir, shard) for shard in shards):
+                break
+            time.sleep(poll_seconds)
+            continue
+
+        first, last = claimed
+        shard = shard_name(first, last)
+        lease_path = queue_dir.joinpath(LEASES_DIR, f"{shard}.lease")
+        tmp_dir = queue_dir.joinpath(SHARDS_DIR, f"{shard}.{worker}.tmp")
+        if sum_table is None:
+            sum_table = aliquot_sum_sieve(config["n"])
+
+        with Heartbeat(lease_path, worker, config["lease_seconds"] / 3) as heartbeat:
+            try:
+                aliquot_sequence_sequences(
+                    last,
+                    directory=tmp_dir,
+                    seq_iteration_cutoff=config["seq_iteration_cutoff"],
+                    progress=False,
+                    first_n=first,
+                    sum_table=sum_table,
+                )
+            except FileNotFoundError:
+                # the lease was taken over and the new holder published first, dropping this partial shard
+                if not is_complete(queue_dir, shard):
+                    raise
+        if is_complete(queue_dir, shard) and (heartbeat.lost.is_set() or not tmp_dir.exists()):
+            # lost the lease, or the partial shard with it, and the new holder already published, nothing to add
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+        elif publish_shard(queue_dir, shard, tmp_dir, worker):
+            published += 1
+        release_lease(lease_path, worker)
+
+    return published
+
+
+def queue_status(queue_dir: Path) -> "dict[str, int]":
+    """Number of finished, leased and open shards."""
+    config = load_work_queue(queue_dir)
+    status = {"finished": 0, "leased": 0, "open": 0}
+    for first, last in shard_ranges(config):
+        shard = shard_name(first, last)
+        lease_path = queue_dir.joinpath(LEASES_DIR, f"{shard}.lease")
+        if is_complete(queue_dir, shard):
+            status["finished"] += 1
+        elif not lease_expired(lease_path, config["lease_seconds"]):
+            status["leased"] += 1
+        else:
+            status["open"] += 1
+    return status
+
+
+def merge_shards(queue_dir: Path, store_directory: Path) -> int:
+    """
+    Concatenate every shard, in n order, into one sequence store for 1..n.
+
+    Raises:
+        ValueError: if a shard isn't finished yet.
+
+    Returns:
+        int: number of rows in the merged store
+    """
+    config = load_work_queue(queue_dir)
+    shards = [shard_name(first, last) for first, last in shard_ranges(config)]
+    unfinished = [shard for shard in shards if not is_complete(queue_dir, shard)]
+    if unfinished:
+        raise ValueError(f"{len(unfinished)} shards aren't finished, first {unfinished[0]}.")
+    return concatenate_sequence_stores([queue_dir.joinpath(SHARDS_DIR, shard) for shard in shards], store_directory)
+
+
+def run_local_workers(queue_dir: Path, workers: int = 4) -> None:
+    """Run a sweep queue to completion with worker processes on this host, eg to try the queue out."""
+    processes = [Process(target=run_worker, args=(queue_dir,)) for _ in range(workers)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
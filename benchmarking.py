@@ -0,0 +1,310 @@
+"""
+Benchmark harness for comparing implementations of the same function of n, eg the Fibonacci and factorial variants.
+
+Every variant is timed over a grid of n, smallest first. A timing is the median and interquartile range of repeated
+samples, each sample being enough back to back calls to take at least min_sample_time, so fast variants aren't
+measured at the resolution of the clock. A variant is skipped for the rest of the grid once one call takes longer
+than its time budget, or is predicted to take twice that from how its time grew between the previous two n, which
+keeps exponential variants from eating the whole run. The first call at every n runs in a forked child that is
+killed once the budget has passed, so even a grid that jumps straight to a hopeless n costs a budget rather than
+hanging. A variant that raises, eg RecursionError, is skipped for the rest of the grid.
+
+Results are plain dicts, written as JSON so that a later run can be compared against them as a baseline.
+"""
+
+import json
+import math
+import multiprocessing
+import platform
+import statistics
+from pathlib import Path
+from time import perf_counter
+from typing import Callable, Iterable
+
+
+CHILD_STARTUP_SECONDS: float = 0.5  # allowed on top of the budget before the first call's child is killed
+CAN_FORK: bool = "fork" in multiprocessing.get_all_start_methods()
+
+
+def timed_call(func: Callable[[int], object], n: int) -> float:
+    counter_start = perf_counter()
+    func(n)
+    return perf_counter() - counter_start
+
+
+def _first_call_child(func: Callable[[int], object], n: int, connection) -> None:
+    try:
+        connection.send(("ok", timed_call(func, n)))
+    except Exception as e:
+        try:
+            connection.send(("error", e))
+        except Exception:  # an exception that can't be pickled
+            connection.send(("error", RuntimeError(repr(e))))
+
+
+def first_call_time(func: Callable[[int], object], n: int, budget: float) -> "float | None":
+    """
+    Time of one call of func(n), made in a forked child that is killed if it hasn't returned once budget seconds
+    have passed. Forking rather than spawning means func doesn't have to be picklable, eg a lambda. Without fork
+    the call is made in this process, and can't be cut short.
+
+    Returns:
+        float | None: the seconds the call took, None if it was killed
+
+    Raises:
+        Exception: whatever func(n) raised, or ChildProcessError if the child died without a word.
+    """
+    if not CAN_FORK:
+        return timed_call(func, n)
+
+    context = multiprocessing.get_context("fork")
+    receiver, sender = context.Pipe(duplex=False)
+    child = context.Process(target=_first_call_child, args=(func, n, sender), daemon=True)
+    child.start()
+    sender.close()
+    try:
+        if not receiver.poll(budget + CHILD_STARTUP_SECONDS):
+            return None
+        try:
+            status, value = receiver.recv()
+        except EOFError:
+            child.join()
+            raise ChildProcessError(f"Benchmark child died with exit code {child.exitcode}.") from None
+    finally:
+        if child.is_alive():
+            child.kill()
+        child.join()
+        receiver.close()
+    if status == "error":
+        raise value
+    return value
+
+
+def time_variant(
+    func: Callable[[int], object], n: int, budget: float, repeats: int = 7, min_sample_time: float = 1e-3
+) -> dict:
+    """
+    Median and interquartile range of the time of one call of func(n).
+
+    The first call is made by first_call_time, so it is cut short at the budget. Samples are then taken until
+    there are repeats of them, or at least 3 and budget seconds have been spent.
+
+    Args:
+        func (Callable[[int], object]): variant to time
+        n (int): argument
+        budget (float): seconds a single call may take, see run_grid
+        repeats (int, optional): number of samples. Defaults to 7.
+        min_sample_time (float, optional): least seconds per sample. Defaults to 1e-3.
+
+    Returns:
+        dict: the timing, with "status" "ok", or "over budget" if the first call took longer than budget, its
+            "median" then being the time of that call, or just budget if it was cut short
+    """
+    first = first_call_time(func, n, budget)
+    if first is None or first > budget:
+        return {"n": n, "status": "over budget", "median": budget if first is None else first}
+
+    number = max(1, math.ceil(min_sample_time / first)) if first > 0 else 1000
+    samples = []
+    spent = 0.0
+    while len(samples) < repeats and (len(samples) < 3 or spent < budget):
+        counter_start = perf_counter()
+        for _ in range(number):
+            func(n)
+        elapsed = perf_counter() - counter_start
+        spent += elapsed
+        samples.append(elapsed / number)
+
+    median = statistics.median(samples)
+    quartiles = statistics.quantiles(samples, n=4, method="inclusive")
+    return {
+        "n": n,
+        "status": "ok",
+        "median": median,
+        "iqr": quartiles[2] - quartiles[0],
+        "ops_per_second": 1 / median if median > 0 else None,
+        "calls": number * len(samples),
+    }
+
+
+def predicted_time(timings: "list[dict]", n: int) -> "float | None":
+    """
+    Time of a call at n extrapolated from the last two timings, assuming time grows like n^k locally.
+    None if there aren't two timings to go on.
+    """
+    if len(timings) < 2:
+        return None
+    (n1, t1), (n2, t2) = ((timing["n"], timing["median"]) for timing in timings[-2:])
+    if t1 <= 0 or t2 <= 0 or n2 <= n1 or n1 <= 0:
+        return None
+    exponent = max(math.log(t2 / t1) / math.log(n2 / n1), 0.0)
+    return t2 * (n / n2) ** exponent
+
+
+def run_grid(
+    variants: "dict[str, Callable[[int], object]]",
+    ns: "Iterable[int]",
+    budget: float = 1.0,
+    budgets: "dict[str, float] | None" = None,
+    repeats: int = 7,
+    min_sample_time: float = 1e-3,
+) -> "list[dict]":
+    """
+    Time every variant at every n of the grid, see time_variant.
+
+    Args:
+        variants (dict[str, Callable[[int], object]]): variants by name
+        ns (Iterable[int]): grid of n, timed in increasing order
+        budget (float, optional): seconds a single call may take before a variant is skipped for larger n.
+            Defaults to 1.0.
+        budgets (dict[str, float], optional): budget of particular variants, by name. Defaults to None.
+        repeats (int, optional): number of samples per timing. Defaults to 7.
+        min_sample_time (float, optional): least seconds per sample. Defaults to 1e-3.
+
+    Returns:
+        list[dict]: a result per variant and n, with "variant", "n" and "status", and for status "ok" the
+            "median" and "iqr" seconds per call, "ops_per_second" and number of "calls" timed
+    """
+    ns = sorted(ns)
+    budgets = budgets or {}
+    results = []
+    for name, func in variants.items():
+        variant_budget = budgets.get(name, budget)
+        timings = []
+        skipped = None
+        for n in ns:
+            if skipped is None:
+                predicted = predicted_time(timings, n)
+                # only skip on a clear miss, a noisy small n timing can throw the prediction off
+                if predicted is not None and predicted > 2 * variant_budget:
+                    skipped = f"skipped, predicted {predicted:.3g}s over budget"
+            if skipped is not None:
+                results.append({"variant": name, "n": n, "status": skipped})
+                continue
+            try:
+                timing = time_variant(func, n, variant_budget, repeats, min_sample_time)
+            except Exception as e:
+                skipped = f"skipped after {type(e).__name__} at n = {n}"
+                results.append({"variant": name, "n": n, "status": f"error: {type(e).__name__}"})
+                continue
+            if timing["status"] != "ok":
+                skipped = f"skipped, over budget at n = {n}"
+            else:
+                timings.append(timing)
+            results.append({"variant": name, **timing})
+    return results
+
+
+def format_results(results: "list[dict]") -> str:
+    """
+    A table with a row per variant and a column per n, of median times with their interquartile range relative to
+    the median, and calls per second. The fastest at every n is marked with *.
+    """
+    if not results:
+        return ""
+    variants = list(dict.fromkeys(result["variant"] for result in results))
+    ns = sorted({result["n"] for result in results})
+    by_key = {(result["variant"], result["n"]): result for result in results if result["status"] == "ok"}
+    fastest = {}
+    for n in ns:
+        timed = [by_key[variant, n] for variant in variants if (variant, n) in by_key]
+        if timed:
+            fastest[n] = min(timed, key=lambda result: result["median"])["variant"]
+
+    name_width = max(len(variant) for variant in variants)
+    lines = [" " * name_width + "".join(f"{f'n = {n}':>30}" for n in ns)]
+    for variant in variants:
+        cells = []
+        for n in ns:
+            result = by_key.get((variant, n))
+            if result is None:
+                cells.append(f"{'-':>30}")
+            else:
+                mark = "*" if fastest[n] == variant else " "
+                cells.append(
+                    f"{result['median']:.2e}s ±{result['iqr'] / result['median']:.0%}"
+                    f" {result['ops_per_second']:.2e}/s{mark}".rjust(30)
+                )
+        lines.append(f"{variant:<{name_width}}" + "".join(cells))
+    return "\n".join(lines)
+
+
+def write_results(results: "list[dict]", path: Path) -> None:
+    """Write results to path as JSON, along with the Python build they were timed on."""
+    document = {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(document, f, indent=2)
+
+
+def load_results(path: Path) -> "list[dict]":
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)["results"]
+
+
+def compare_to_baseline(results: "list[dict]", baseline: "list[dict]", threshold: float = 0.1) -> "list[dict]":
+    """
+    Timings that got slower than their baseline by more than threshold, as a fraction of the baseline.
+
+    Only timings that are "ok" in both are compared. A result whose slowdown is within the interquartile ranges of
+    both timings is noise rather than a regression, and isn't reported.
+
+    Returns:
+        list[dict]: "variant", "n", "baseline" and "median" seconds and their "ratio", slowest first
+    """
+    baseline_by_key = {(result["variant"], result["n"]): result for result in baseline if result["status"] == "ok"}
+    regressions = []
+    for result in results:
+        base = baseline_by_key.get((result["variant"], result["n"]))
+        if result["status"] != "ok" or base is None:
+            continue
+        slowdown = result["median"] - base["median"]
+        if slowdown > threshold * base["median"] and slowdown > result["iqr"] + base["iqr"]:
+            regressions.append(
+                {
+                    "variant": result["variant"],
+                    "n": result["n"],
+                    "baseline": base["median"],
+                    "median": result["median"],
+                    "ratio": result["median"] / base["median"],
+                }
+            )
+    return sorted(regressions, key=lambda regression: -regression["ratio"])
+
+
+def run_benchmark(
+    variants: "dict[str, Callable[[int], object]]",
+    ns: "Iterable[int]",
+    budget: float = 1.0,
+    budgets: "dict[str, float] | None" = None,
+    path: "Path | None" = None,
+    baseline: "Path | None" = None,
+    threshold: float = 0.1,
+) -> "list[dict]":
+    """
+    Time the variants over the grid and print the table, see run_grid. Optionally write the results to path,
+    and print the regressions against the results at baseline, see compare_to_baseline.
+
+    Returns:
+        list[dict]: the regressions, empty without a baseline
+    """
+    results = run_grid(variants, ns, budget, budgets)
+    print(format_results(results))
+    if path is not None:
+        write_results(results, path)
+
+    regressions = []
+    if baseline is not None:
+        regressions = compare_to_baseline(results, load_results(baseline), threshold)
+        for regression in regressions:
+            print(
+                f"Regression: {regression['variant']} at n = {regression['n']},"
+                f" {regression['baseline']:.3e}s -> {regression['median']:.3e}s ({regression['ratio']:.2f}x)"
+            )
+        if not regressions:
+            print(f"No regressions beyond {threshold:.0%} against {baseline}")
+    return regressions
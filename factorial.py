@@ -10,6 +10,9 @@ The value of 0! is 1, according to the convention for an empty product.
 """
 
 import functools
+from pathlib import Path
+
+from benchmarking import run_benchmark
 
 
 # Lambda one-liner implementation for the factorial of n
@@ -48,6 +51,31 @@ def factorial_iterative(n: int) -> int:
     return n
 
 
+def benchmark(
+    ns: tuple[int, ...] = (10, 100, 500, 900, 5000, 2 * 10**4),
+    budget: float = 0.5,
+    path: "Path | None" = None,
+    baseline: "Path | None" = None,
+    threshold: float = 0.1,
+) -> list[dict]:
+    """
+    Time benchmarking for factorial functions over a grid of n, see benchmarking.run_benchmark.
+    factorial_recursive is skipped from the first n that exceeds the recursion limit.
+
+    Args:
+        ns: values to take the factorial of
+        budget: seconds a single call may take before a function is skipped for larger n
+        path: write the results to this JSON file
+        baseline: JSON results of an earlier run to report regressions against
+        threshold: slowdown against the baseline reported as a regression, as a fraction
+
+    Return:
+        list[dict]: the regressions against baseline
+    """
+    variants = {"f": f, "factorial_recursive": factorial_recursive, "factorial_iterative": factorial_iterative}
+    return run_benchmark(variants, ns, budget, path=path, baseline=baseline, threshold=threshold)
+
+
 if __name__ == "__main__":
     test1 = f(input1 := int(input("Input number: ")))
     print(f"{input1}! = {test1}")
@@ -55,3 +83,5 @@ if __name__ == "__main__":
     print(f"{input2}! = {test2}")
     test3 = factorial_iterative(input3 := int(input("Input number: ")))
     print(f"{input3}! = {test3}")
+
+    # benchmark()
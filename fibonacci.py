@@ -16,10 +16,22 @@ etc...
 
 https://stackoverflow.com/questions/494594/how-to-write-the-fibonacci-sequence
 https://stackoverflow.com/questions/37802129/fibonacci-in-python-recursively-into-a-list
+
+The Lucas numbers L_n follow the same recurrence from L_0 = 2, L_1 = 1, and L_n = F_n-1 + F_n+1 = 2 F_n+1 - F_n.
+https://www.nayuki.io/page/fast-fibonacci-algorithms
 """
 
-from statistics import mean
-from time import perf_counter
+from collections import OrderedDict
+from functools import lru_cache
+from math import lcm
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterator
+
+from benchmarking import run_benchmark
+
+if TYPE_CHECKING:
+    import numpy as np
+    import numpy.typing as npt
 
 
 # MARK: Recursive
@@ -91,6 +103,126 @@ def fibonacci_recursive_list(n: int) -> list[int]:
     return fib_list
 
 
+# MARK: Memoized
+class FibonacciCache:
+    """
+    Bounded LRU of Fibonacci numbers F_n by n, shared by every call of fibonacci_memoized.
+
+    Args:
+        max_entries (int, optional): most numbers kept at once, least recently used are evicted first.
+            Defaults to 1024. F_n has about 0.7 n bits, so a bound by count is a bound on memory for a given n.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._values: "OrderedDict[int, int]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def get(self, n: int) -> "int | None":
+        """F_n if it is cached, otherwise None."""
+        value = self._values.get(n)
+        if value is None:
+            self.misses += 1
+            return None
+        self._values.move_to_end(n)
+        self.hits += 1
+        return value
+
+    def peek_pair(self, m: int) -> "tuple[int, int] | None":
+        """
+        F_m-1 and F_m if both are cached, otherwise None. Refreshes their recency, but isn't counted as a hit or
+        miss: it is one probe of a walk, not a lookup.
+        """
+        if m not in self._values or m - 1 not in self._values:
+            return None
+        self._values.move_to_end(m - 1)
+        self._values.move_to_end(m)
+        return self._values[m - 1], self._values[m]
+
+    def add(self, n: int, value: int) -> None:
+        self._values[n] = value
+        self._values.move_to_end(n)
+        if len(self._values) > self.max_entries:
+            self._values.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop every cached number and reset the statistics."""
+        self._values.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions, "size": len(self)}
+
+
+fibonacci_cache = FibonacciCache()
+
+
+def fibonacci_memoized(n: int) -> int:
+    """
+    Memoized recursive implementation to generate F_n, the n-th Fibonacci number,
+    beginning from F_0, sharing fibonacci_cache across calls.
+
+    The recursion F_n -> F_n-1 -> ... is unrolled: it walks down from n to the highest m with F_m and F_m-1
+    cached (or to F_1, F_0), then adds its way back up caching every F_k on the way. Each F_k is computed once
+    instead of exponentially often, and n isn't limited by the recursion limit. A call counts as a cache hit only
+    if F_n itself was cached.
+
+    Raises:
+        ValueError: if n < 0.
+
+    Return:
+        int: the n-th Fibonacci number
+    """
+    if n < 0:
+        raise ValueError("Input must be a positive integer or zero: n >= 0.")
+    if n < 2:
+        return n
+
+    current = fibonacci_cache.get(n)
+    if current is not None:
+        return current
+
+    m = n - 1
+    while m > 1:
+        pair = fibonacci_cache.peek_pair(m)
+        if pair is not None:
+            previous, current = pair
+            break
+        m -= 1
+    else:
+        previous, current = 0, 1  # F_0, F_1
+
+    for k in range(m + 1, n + 1):
+        previous, current = current, previous + current
+        fibonacci_cache.add(k, current)
+    return current
+
+
+def fibonacci_memoized_list(n: int) -> list[int]:
+    """
+    Memoized recursive implementation to generate the Fibonacci sequence up to F_n,
+    starting from F_0
+
+    fibonacci_recursive_list_wasteful with the recursion memoized: each call after the first finds F_i-1 and
+    F_i-2 in the cache.
+
+    Raises:
+        ValueError: if n < 0.
+
+    Return:
+        list[int]: list of the first n+1 Fibonacci numbers (sequence up to F_n)
+    """
+    if n < 0:
+        raise ValueError("Input must be a positive integer or zero: n >= 0.")
+    return [fibonacci_memoized(i) for i in range(n + 1)]
+
+
 # MARK: Iterative
 def fibonacci_iterative(n: int) -> int:
     """
@@ -208,57 +340,301 @@ def fibonacci_yield(n: int) -> list[int]:
     return fib_list
 
 
-def benchmark(n: int = 40):
+# MARK: Fast Doubling
+def fibonacci_pair(n: int) -> tuple[int, int]:
     """
-    Time benchmarking for Fibonacci sequence functions.
+    Fast doubling implementation to generate (F_n, F_n+1) with O(log n) multiplications, from
+    F_2k = F_k+1^2 - (F_k+1 - F_k)^2 and F_2k+1 = F_k^2 + F_k+1^2, walking the bits of n from the top.
+
+    Only squares are taken, which CPython multiplies faster than two different big ints.
+
+    Raises:
+        ValueError: if n < 0.
+
+    Return:
+        tuple[int, int]: the n-th and (n+1)-th Fibonacci numbers
+    """
+    if n < 0:
+        raise ValueError("Input must be a positive integer or zero: n >= 0.")
+    a, b = 0, 1  # F_k, F_k+1 for k = the bits of n seen so far
+    for bit in bin(n)[2:]:
+        a, b = b * b - (b - a) ** 2, a * a + b * b
+        if bit == "1":
+            a, b = b, a + b
+    return a, b
+
+
+def fibonacci_fast_doubling(n: int) -> int:
+    """
+    Fast doubling implementation to generate F_n, the n-th Fibonacci number,
+    beginning from F_0, see fibonacci_pair.
+
+    The last doubling step is the most expensive, and only half of it is needed for F_n alone.
+
+    Raises:
+        ValueError: if n < 0.
+
+    Return:
+        int: the n-th Fibonacci number
+    """
+    a, b = fibonacci_pair(n >> 1)  # raises for n < 0 too
+    if n & 1:
+        return a * a + b * b
+    return b * b - (b - a) ** 2
+
+
+def lucas(n: int) -> int:
+    """
+    Fast doubling implementation to generate L_n, the n-th Lucas number,
+    beginning from L_0 = 2
+
+    Raises:
+        ValueError: if n < 0.
+
+    Return:
+        int: the n-th Lucas number
+    """
+    f_n, f_n1 = fibonacci_pair(n)
+    return 2 * f_n1 - f_n
+
+
+# MARK: Modular
+def fibonacci_pair_mod(n: int, m: int) -> tuple[int, int]:
+    """
+    Fast doubling implementation to generate (F_n mod m, F_n+1 mod m), see fibonacci_pair, without ever
+    holding a number larger than m^2.
+
+    Raises:
+        ValueError: if n < 0 or m < 1.
+
+    Return:
+        tuple[int, int]: the n-th and (n+1)-th Fibonacci numbers modulo m
+    """
+    if n < 0:
+        raise ValueError("Input must be a positive integer or zero: n >= 0.")
+    if m < 1:
+        raise ValueError("Modulus must be a positive integer: m >= 1.")
+    a, b = 0, 1 % m
+    for bit in bin(n)[2:]:
+        a, b = a * (2 * b - a) % m, (a * a + b * b) % m
+        if bit == "1":
+            a, b = b, (a + b) % m
+    return a, b
+
+
+def prime_factors(n: int) -> dict[int, int]:
+    """Prime factorization of n >= 1 by trial division, as {prime: exponent}."""
+    factors = {}
+    p = 2
+    while p * p <= n:
+        while n % p == 0:
+            factors[p] = factors.get(p, 0) + 1
+            n //= p
+        p += 1 if p == 2 else 2
+    if n > 1:
+        factors[n] = factors.get(n, 0) + 1
+    return factors
+
+
+@lru_cache(maxsize=1024)
+def pisano_period(m: int) -> int:
+    """
+    The Pisano period pi(m), the period of the Fibonacci numbers modulo m, cached per m.
+
+    pi(m) divides the lcm over the prime powers p^k of m of p^(k-1) pi(p), and pi(p) divides 3 for p = 2, 20 for
+    p = 5, p - 1 for p = +-1 mod 5 and 2 (p + 1) for p = +-2 mod 5. Starting from that multiple, prime factors are
+    divided out while F_n, F_n+1 = 0, 1 mod m still holds, which leaves the least period. The cost is trial
+    division of m and of p +- 1, and O(log m) fast doubling steps per prime factor tried.
+
+    Raises:
+        ValueError: if m < 1.
+
+    Return:
+        int: the Pisano period of m
+
+    Examples:
+    >>> [pisano_period(m) for m in range(1, 11)]
+    [1, 3, 8, 6, 20, 24, 16, 12, 24, 60]
+    """
+    if m < 1:
+        raise ValueError("Modulus must be a positive integer: m >= 1.")
+    period = 1
+    for p, k in prime_factors(m).items():
+        if p == 2:
+            bound = 3
+        elif p == 5:
+            bound = 20
+        elif p % 5 in (1, 4):
+            bound = p - 1
+        else:
+            bound = 2 * (p + 1)
+        period = lcm(period, p ** (k - 1) * bound)
+
+    for q in prime_factors(period):
+        while period % q == 0 and fibonacci_pair_mod(period // q, m) == (0, 1 % m):
+            period //= q
+    return period
+
+
+def fibonacci_mod(n: int, m: int, pisano: bool = False) -> int:
+    """
+    Fast doubling implementation to generate F_n mod m, the n-th Fibonacci number modulo m,
+    beginning from F_0, see fibonacci_pair_mod.
+
+    Args:
+        n: index of the Fibonacci number
+        m: modulus
+        pisano: reduce n modulo the Pisano period of m first, see pisano_period. It pays off when n is much
+            larger than m, or for many calls with the same m.
+
+    Raises:
+        ValueError: if n < 0 or m < 1.
+
+    Return:
+        int: the n-th Fibonacci number modulo m
+    """
+    if n < 0:
+        raise ValueError("Input must be a positive integer or zero: n >= 0.")
+    if pisano:
+        n %= pisano_period(m)
+    return fibonacci_pair_mod(n, m)[0]
+
+
+def fibonacci_mod_array(ns: "npt.ArrayLike", m: int, pisano: bool = False) -> "npt.NDArray[np.uint64]":
+    """
+    Vectorized fibonacci_mod over an array of n, in NumPy uint64 arithmetic.
+
+    Every element takes the same doubling steps, one per bit of the largest n, and takes the extra step on its own
+    bits. Before its leading bit an element stays at F_0, F_1, which doubling leaves unchanged. Residues are below
+    m <= 2^32, so their products fit in uint64.
 
     Args:
-        n: index to generate Fibonacci sequence up to, F_n
-    """
-    fibonacci_recursive_times = []
-    fibonacci_recursive_list_wasteful_times = []
-    fibonacci_recursive_list_times = []
-    fibonacci_iterative_times = []
-    fibonacci_iterative_list_times = []
-    fibonacci_list_indexing_times = []
-    fibonacci_yield_times = []
-
-    for _ in range(5):
-        counter_start = perf_counter()
-        fibonacci_recursive(n)
-        fibonacci_recursive_times.append(perf_counter() - counter_start)
-
-        counter_start = perf_counter()
-        fibonacci_recursive_list_wasteful(n)
-        fibonacci_recursive_list_wasteful_times.append(perf_counter() - counter_start)
-
-        counter_start = perf_counter()
-        fibonacci_recursive_list(n)
-        fibonacci_recursive_list_times.append(perf_counter() - counter_start)
-
-        counter_start = perf_counter()
-        fibonacci_iterative(n)
-        fibonacci_iterative_times.append(perf_counter() - counter_start)
-
-        counter_start = perf_counter()
-        fibonacci_iterative_list(n)
-        fibonacci_iterative_list_times.append(perf_counter() - counter_start)
-
-        counter_start = perf_counter()
-        fibonacci_list_indexing(n)
-        fibonacci_list_indexing_times.append(perf_counter() - counter_start)
-
-        counter_start = perf_counter()
-        fibonacci_yield(n)
-        fibonacci_yield_times.append(perf_counter() - counter_start)
-
-    print(f"fibonacci_recursive Average elapsed time: {mean(fibonacci_recursive_times)}")
-    print(f"fibonacci_recursive_list_wasteful Average elapsed time: {mean(fibonacci_recursive_list_wasteful_times)}")
-    print(f"fibonacci_recursive_list Average elapsed time: {mean(fibonacci_recursive_list_times)}")
-    print(f"fibonacci_iterative Average elapsed time: {mean(fibonacci_iterative_times)}")
-    print(f"fibonacci_iterative_list Average elapsed time: {mean(fibonacci_iterative_list_times)}")
-    print(f"fibonacci_list_indexing Average elapsed time: {mean(fibonacci_list_indexing_times)}")
-    print(f"fibonacci_yield Average elapsed time: {mean(fibonacci_yield_times)}")
+        ns: indices of the Fibonacci numbers, any shape
+        m: modulus, at most 2^32
+        pisano: reduce every n modulo the Pisano period of m first, see pisano_period
+
+    Raises:
+        ValueError: if any n < 0, m < 1 or m > 2^32.
+
+    Return:
+        npt.NDArray[np.uint64]: F_n mod m for every n of ns, in the shape of ns
+    """
+    import numpy as np
+
+    if m < 1:
+        raise ValueError("Modulus must be a positive integer: m >= 1.")
+    if m > 2**32:
+        raise ValueError("Modulus must be at most 2^32 for uint64 arithmetic: m <= 2^32.")
+    ns = np.asarray(ns)
+    if ns.size and ns.min() < 0:
+        raise ValueError("Input must be a positive integer or zero: n >= 0.")
+    ns = ns.astype(np.uint64)
+    if pisano:
+        ns %= np.uint64(pisano_period(m))
+
+    modulus = np.uint64(m)
+    a = np.zeros(ns.shape, dtype=np.uint64)
+    b = np.full(ns.shape, 1 % m, dtype=np.uint64)
+    for shift in range(int(ns.max(initial=0)).bit_length() - 1, -1, -1):
+        # F_2k = F_k (2 F_k+1 - F_k), F_2k+1 = F_k^2 + F_k+1^2, with 2 F_k+1 - F_k + m < 3m kept non-negative
+        a, b = a * ((2 * b + modulus - a) % modulus) % modulus, (a * a % modulus + b * b % modulus) % modulus
+        bit = ((ns >> np.uint64(shift)) & np.uint64(1)).astype(bool)
+        a, b = np.where(bit, b, a), np.where(bit, (a + b) % modulus, b)
+    return a
+
+
+# MARK: Streaming Range
+def fib_range(start: int, stop: "int | None" = None, step: int = 1) -> Iterator[int]:
+    """
+    Streaming implementation to generate F_start, F_start+step, ... up to but excluding F_stop, like range,
+    or forever if stop is None.
+
+    Seeks to F_start, F_start+1 with fast doubling in O(log start) multiplications, see fibonacci_pair, then
+    yields lazily holding only the current pair. Steps of up to 8 are taken by adding, longer ones by the
+    jump F_k+s = F_k F_s+1 + F_k-1 F_s, F_k+s+1 = F_k+1 F_s+1 + F_k F_s, which costs four multiplications by
+    the much smaller F_s and F_s+1.
+
+    Raises:
+        ValueError: if start < 0 or step < 1.
+
+    Yield:
+        int: the Fibonacci numbers F_start, F_start+step, ... below index stop
+
+    Examples:
+    >>> list(fib_range(10, 20, 3))
+    [55, 233, 987, 4181]
+    """
+    if start < 0:
+        raise ValueError("Input must be a positive integer or zero: n >= 0.")
+    if step < 1:
+        raise ValueError("Step must be a positive integer: step >= 1.")
+
+    def fib():
+        """
+        Generator for the Fibonacci sequence from F_start by step, validated above so that errors are raised
+        when fib_range is called rather than on the first next.
+
+        Yields:
+            int: next value in the Fibonacci range
+        """
+        if stop is not None and stop <= start:
+            return
+        a, b = fibonacci_pair(start)  # F_k, F_k+1
+        f_s, f_s1 = fibonacci_pair(step)
+        k = start
+        while stop is None or k < stop:
+            yield a
+            if step <= 8:
+                for _ in range(step):
+                    a, b = b, a + b
+            else:
+                a, b = a * f_s1 + (b - a) * f_s, b * f_s1 + a * f_s
+            k += step
+
+    return fib()
+
+
+def benchmark(
+    ns: tuple[int, ...] = (10, 20, 30, 100, 1000, 10**4, 10**5),
+    budget: float = 0.5,
+    path: "Path | None" = None,
+    baseline: "Path | None" = None,
+    threshold: float = 0.1,
+) -> list[dict]:
+    """
+    Time benchmarking for Fibonacci sequence functions over a grid of n, see benchmarking.run_benchmark.
+
+    The table shows where fast doubling overtakes fibonacci_iterative, and the exponential recursive variants are
+    skipped once a call takes longer than budget.
+
+    Args:
+        ns: indices to generate Fibonacci numbers or sequences up to, F_n
+        budget: seconds a single call may take before a function is skipped for larger n
+        path: write the results to this JSON file
+        baseline: JSON results of an earlier run to report regressions against
+        threshold: slowdown against the baseline reported as a regression, as a fraction
+
+    Return:
+        list[dict]: the regressions against baseline
+    """
+
+    def fibonacci_memoized_cold(n: int) -> int:
+        fibonacci_cache.clear()  # time computing F_n, not a cache hit
+        return fibonacci_memoized(n)
+
+    variants = {
+        "fibonacci_recursive": fibonacci_recursive,
+        "fibonacci_recursive_list_wasteful": fibonacci_recursive_list_wasteful,
+        "fibonacci_recursive_list": fibonacci_recursive_list,
+        "fibonacci_memoized": fibonacci_memoized_cold,
+        "fibonacci_iterative": fibonacci_iterative,
+        "fibonacci_iterative_list": fibonacci_iterative_list,
+        "fibonacci_list_indexing": fibonacci_list_indexing,
+        "fibonacci_yield": fibonacci_yield,
+        "fibonacci_fast_doubling": fibonacci_fast_doubling,
+        "fib_range": lambda n: list(fib_range(0, n + 1)),
+    }
+    return run_benchmark(variants, ns, budget, path=path, baseline=baseline, threshold=threshold)
 
 
 if __name__ == "__main__":
@@ -271,5 +647,16 @@ if __name__ == "__main__":
     print(f'Fibonacci sequence: {fibonacci_iterative_list(int(input("Input number: ")))}')
     print(f'Fibonacci sequence: {fibonacci_list_indexing(int(input("Input number: ")))}')
     print(f'Fibonacci sequence: {fibonacci_yield(int(input("Input number: ")))}')
-
-    # benchmark(40)
+    test3 = fibonacci_fast_doubling(input3 := int(input("Input number: ")))
+    print(f"Fibonacci number F_{input3} = {test3}")
+    test4 = lucas(input4 := int(input("Input number: ")))
+    print(f"Lucas number L_{input4} = {test4}")
+    test5 = fibonacci_memoized(input5 := int(input("Input number: ")))
+    print(f"Fibonacci number F_{input5} = {test5}, cache {fibonacci_cache.stats()}")
+    test6 = fibonacci_mod(input6 := int(input("Input number: ")), modulus := int(input("Input modulus: ")))
+    print(f"F_{input6} mod {modulus} = {test6}, Pisano period {pisano_period(modulus)}")
+
+    start = int(input("Input start: "))
+    print(f'Fibonacci range: {list(fib_range(start, int(input("Input stop: ")), int(input("Input step: "))))}')
+
+    # benchmark()